@@ -0,0 +1,232 @@
+from Config.logs_config import setup_logging
+from Config.config import AnimeFetcherConfig
+from AnimeWatcher.WebOperations import WebInteractions
+from AnimeWatcher.SearchOperations import SearchInteractions
+from AnimeWatcher.SessionOperations import create_session
+from AnimeWatcher.CatalogOperations import AnimeCatalog
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import Counter
+from bs4 import BeautifulSoup
+import requests
+import threading
+import hashlib
+import random
+
+# Setup logging
+logger = setup_logging(AnimeFetcherConfig.ANIME_FETCH_LOG_FILENAME,
+                       AnimeFetcherConfig.ANIME_FETCH_LOG_PATH)
+
+
+class RequestThrottle:
+    def __init__(self):
+        """
+        Initializes the throttle shared by the crawler threads: after a random number of requests
+        (between MIN_SLEEP_THRESHOLD and MAX_SLEEP_THRESHOLD) every thread pauses for a random duration
+        (between MIN_SLEEP_DURATION and MAX_SLEEP_DURATION).
+        """
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.reset()
+
+    def reset(self):
+        """ Start counting the requests again, with a new random threshold before the next pause. """
+        self.request_count = 0
+        self.threshold = random.randint(AnimeFetcherConfig.MIN_SLEEP_THRESHOLD, AnimeFetcherConfig.MAX_SLEEP_THRESHOLD)
+
+    def wait(self):
+        """
+        Wait before sending a request (the lock is held while sleeping so no thread sends a request during the pause).
+
+        Returns:
+            bool: True if the request can be sent, False if the crawl was stopped.
+        """
+        with self.lock:
+            if self.request_count >= self.threshold:
+                duration = random.randint(AnimeFetcherConfig.MIN_SLEEP_DURATION, AnimeFetcherConfig.MAX_SLEEP_DURATION)
+                logger.info(f"Sleeping {duration} seconds after {self.request_count} requests")
+                # Interrupted as soon as the crawl is stopped
+                self.stop_event.wait(duration)
+                self.reset()
+            self.request_count += 1
+        return not self.stop_event.is_set()
+
+    def refund(self):
+        """ Don't count the last request (e.g. a 304 Not Modified response or a page whose content did not change). """
+        with self.lock:
+            self.request_count = max(0, self.request_count - 1)
+
+    def stop(self):
+        """ Stop the crawl, a thread pausing or waiting for its turn returns right away. """
+        self.stop_event.set()
+
+
+class AnimeFetcher:
+    def __init__(self, web_interactions=None, catalog=None, max_workers=AnimeFetcherConfig.MAX_WORKERS):
+        """
+        Initializes the crawler of the full anime list.
+
+        Args:
+            web_interactions (WebInteractions, optional): Used to format the anime list URLs. Defaults to a new instance (no browser is started).
+            catalog (AnimeCatalog, optional): The catalog to fill. Defaults to the catalog in AnimeFetcherConfig.CATALOG_FILE.
+            max_workers (int, optional): The number of pages fetched at the same time. Defaults to AnimeFetcherConfig.MAX_WORKERS.
+        """
+        self.web_interactions = web_interactions if web_interactions else WebInteractions()
+        self.catalog = catalog if catalog else AnimeCatalog()
+        self.max_workers = max(1, max_workers)
+        self.search_interactions = SearchInteractions(create_session(pool_maxsize=self.max_workers))
+        self.throttle = RequestThrottle()
+        self.tasks_since_checkpoint = 0
+        self.checkpoint_lock = threading.Lock()
+        # Number of unchanged pages, changed pages and updated records of the crawl
+        self.stats = Counter()
+
+    def checkpoint(self, force=False):
+        """
+        Save the catalog every CHECKPOINT_INTERVAL finished tasks (or now if forced).
+        """
+        with self.checkpoint_lock:
+            self.tasks_since_checkpoint += 0 if force else 1
+            if not force and self.tasks_since_checkpoint < AnimeFetcherConfig.CHECKPOINT_INTERVAL:
+                return
+            self.tasks_since_checkpoint = 0
+        self.catalog.save()
+
+    def add_stat(self, name, value=1):
+        """
+        Add to a statistic of the crawl (the pages are fetched by several threads).
+
+        Args:
+            name (str): The statistic ('unchanged_pages', 'changed_pages' or 'updated_records').
+            value (int, optional): The amount to add. Defaults to 1.
+        """
+        with self.checkpoint_lock:
+            self.stats[name] += value
+
+    def fetch_list_page(self, page_number):
+        """
+        Fetch a page of the anime list and store its new or renamed animes in the catalog.
+
+        The page is requested with the validators of its last version (ETag/Last-Modified) and only
+        re-parsed if the server sent a new version whose content hash differs from the stored one.
+
+        Returns:
+            bool: True if the page was fetched (or is unchanged), False otherwise.
+        """
+        if not self.throttle.wait():
+            return False
+        url = self.web_interactions.format_anime_url(page_number)
+        page = self.catalog.get_page(page_number) or {}
+        try:
+            response = self.search_interactions.get_page_if_modified(url, page.get('etag'), page.get('last_modified'))
+        except requests.RequestException as e:
+            logger.error(f"Error while fetching page {page_number} of the anime list: {e}")
+            return False
+        if response is None:
+            return False
+
+        if response.status_code == 304:
+            self.throttle.refund()
+            self.catalog.mark_page_checked(page_number)
+            self.add_stat('unchanged_pages')
+            return True
+        content_hash = hashlib.sha256(response.content).hexdigest()
+        if page and content_hash == page.get('hash'):
+            # Same content as the stored version, nothing to parse
+            self.throttle.refund()
+            self.catalog.mark_page_checked(page_number)
+            self.add_stat('unchanged_pages')
+            return True
+
+        animes = self.search_interactions.parse_anime_listing(BeautifulSoup(response.content, "html.parser"), url)
+        if not animes:
+            logger.warning(f"No anime found on page {page_number} of the anime list")
+            return False
+        changed = self.catalog.set_page(page_number, animes, response.headers.get('ETag'),
+                                        response.headers.get('Last-Modified'), content_hash)
+        self.add_stat('changed_pages')
+        self.add_stat('updated_records', changed)
+        return True
+
+    def fetch_details(self, link):
+        """
+        Fetch the episode count and alternate names of an anime and store them in the catalog.
+
+        Returns:
+            bool: True if the episode count was fetched, False otherwise.
+        """
+        if not self.throttle.wait():
+            return False
+        details = self.search_interactions.fetch_page(link, self.search_interactions.parse_anime_details)
+        if details is None or details['episodes'] is None:
+            logger.warning(f"Could not fetch the episodes of {link}")
+            return False
+        self.catalog.set_details(link, details)
+        return True
+
+    def run_tasks(self, function, arguments):
+        """
+        Run the tasks with bounded concurrency, saving the catalog regularly.
+
+        Returns:
+            int: The number of failed tasks.
+        """
+        failures = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(function, argument) for argument in arguments]
+            try:
+                for future in as_completed(futures):
+                    try:
+                        if not future.result():
+                            failures += 1
+                    except Exception as e:
+                        logger.error(f"Error while crawling: {e}")
+                        failures += 1
+                    self.checkpoint()
+            except BaseException:
+                # Stop the pending tasks and the sleeping threads before leaving the executor
+                self.throttle.stop()
+                for future in futures:
+                    future.cancel()
+                raise
+        return failures
+
+    def crawl(self, total_pages=AnimeFetcherConfig.TOTAL_PAGES):
+        """
+        Crawl the anime list, then the details (episode count and alternate names) of every anime.
+        The pages and animes already in the catalog are skipped, so an interrupted crawl resumes where it stopped.
+        Once the catalog is complete, crawling it again refreshes it: only the changed pages are parsed
+        and only the details of the new animes are fetched.
+
+        Args:
+            total_pages (int, optional): The number of pages of the anime list. Defaults to AnimeFetcherConfig.TOTAL_PAGES.
+
+        Returns:
+            list: The animes of the catalog.
+        """
+        self.catalog.start_crawl()
+        try:
+            pages = [page for page in range(1, total_pages + 1) if not self.catalog.is_page_done(page)]
+            logger.info(f"Fetching {len(pages)} of {total_pages} pages of the anime list")
+            failures = self.run_tasks(self.fetch_list_page, pages)
+            logger.info(f"{self.stats['unchanged_pages']} pages unchanged, {self.stats['changed_pages']} pages changed, "
+                        f"{self.stats['updated_records']} animes added or renamed")
+
+            links = self.catalog.pending_details()
+            logger.info(f"Fetching the episodes of {len(links)} animes")
+            failures += self.run_tasks(self.fetch_details, links)
+
+            if failures:
+                logger.warning(f"{failures} requests failed, run the crawler again to resume")
+            else:
+                self.catalog.mark_complete()
+        finally:
+            self.checkpoint(force=True)
+        return self.catalog.records()
+
+
+def main():
+    try:
+        animes = AnimeFetcher().crawl()
+        print(f"{len(animes)} animes in the catalog.")
+    except KeyboardInterrupt:
+        print("\nCrawl interrupted, run it again to resume.")
@@ -0,0 +1,198 @@
+from Config.logs_config import setup_logging
+from Config.config import AnimeWatcherConfig, WebOperationsConfig, BingeConfig
+from AnimeWatcher.UrlOperations import UrlInteractions
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+import threading
+
+# Setup logging
+logger = setup_logging(AnimeWatcherConfig.ANIME_WATCH_LOG_FILENAME,
+                       AnimeWatcherConfig.ANIME_WATCH_LOG_PATH)
+
+
+class BingeSession:
+    def __init__(self, video_player, anime_interactions, episode_tracker, url, anime_name,
+                 current_episode, max_episode, current_episode_url=None, stream_cache=None,
+                 lookahead=BingeConfig.LOOKAHEAD):
+        """
+        Initializes a binge session: the episodes after the current one are queued in the mpv playlist
+        and played one after the other without any user input.
+
+        Args:
+            video_player (VideoPlayer): The video player (already playing the current episode).
+            anime_interactions (AnimeInteractions): Used to format the episode links.
+            episode_tracker (EpisodeTracker): Updated when an episode ends.
+            url (str): The URL of the anime.
+            anime_name (str): The name of the anime.
+            current_episode (int): The episode being played.
+            max_episode (int): The last episode to queue.
+            current_episode_url (str, optional): The URL of the episode being played, its cached stream is dropped if mpv fails to load it. Defaults to None.
+            stream_cache (StreamCache, optional): The cache of the resolved stream URLs. Defaults to None.
+            lookahead (int, optional): The number of episodes resolved ahead of the one being played. Defaults to BingeConfig.LOOKAHEAD.
+        """
+        self.video_player = video_player
+        self.anime_interactions = anime_interactions
+        self.url_interactions = UrlInteractions(WebOperationsConfig.QUALITY, stream_cache)
+        self.episode_tracker = episode_tracker
+        self.url = url
+        self.anime_name = anime_name
+        self.max_episode = max_episode
+        self.lookahead = max(1, lookahead)
+        self.executor = ThreadPoolExecutor(max_workers=self.lookahead)
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        # The entries of the mpv playlist, the first one is being played ((episode_number, episode_url) tuples)
+        self.queued = deque([(current_episode, current_episode_url)])
+        self.last_episode = current_episode
+        # Limits the playlist to the current episode and the episodes resolved ahead
+        self.slots = threading.Semaphore(self.lookahead + 1)
+        self.slots.acquire()
+        self.feeder = threading.Thread(target=self.feed_playlist, daemon=True)
+
+    @property
+    def current_entry(self):
+        """
+        The episode being played and its URL (None if it is unknown).
+        """
+        with self.lock:
+            return self.queued[0] if self.queued else (self.last_episode, None)
+
+    @property
+    def current_episode(self):
+        """
+        The episode being played.
+        """
+        return self.current_entry[0]
+
+    def is_queueing(self):
+        """
+        Check if the session still queues the next episodes.
+
+        Returns:
+            bool: False if the session was stopped or gave up on an episode, True otherwise.
+        """
+        return not self.stop_event.is_set()
+
+    def start(self):
+        """ Start queueing the next episodes. """
+        self.video_player.enable_playlist(self.handle_end_file)
+        self.feeder.start()
+
+    def resolve_episode(self, episode_number):
+        """
+        Resolves the episode link and stream URL of an episode.
+
+        Returns:
+            tuple: The episode URL and the stream URL.
+        """
+        episode_url = self.anime_interactions.format_episode_link(self.url, self.anime_name, episode_number)
+        return episode_url, self.url_interactions.get_streaming_url(episode_url)
+
+    def wait_for_slot(self):
+        """
+        Wait until there is room in the playlist.
+
+        Returns:
+            bool: True if an episode can be queued, False if the session was stopped.
+        """
+        while not self.slots.acquire(timeout=0.5):
+            if self.stop_event.is_set():
+                return False
+        return not self.stop_event.is_set()
+
+    def feed_playlist(self):
+        """
+        Resolves the next episodes in the background (up to lookahead at a time) and appends them
+        to the mpv playlist in order.
+        """
+        episodes = list(range(self.current_episode + 1, self.max_episode + 1))
+        futures = {episode: self.executor.submit(self.resolve_episode, episode)
+                   for episode in episodes[:self.lookahead]}
+        try:
+            for index, episode in enumerate(episodes):
+                if not self.wait_for_slot():
+                    return
+                try:
+                    episode_url, stream_url = self.result_or_retry(episode, futures.pop(episode))
+                except Exception as e:
+                    # Skipping the episode would play the next ones out of order, stop queueing instead
+                    logger.error(f"Error while resolving episode {episode} for binge mode: {e}")
+                    print(f"\nBinge mode stopped: episode {episode} could not be loaded.")
+                    self.slots.release()
+                    self.stop_queueing()
+                    return
+                finally:
+                    # Keep the pipeline full
+                    if index + self.lookahead < len(episodes) and not self.stop_event.is_set():
+                        next_episode = episodes[index + self.lookahead]
+                        futures[next_episode] = self.executor.submit(self.resolve_episode, next_episode)
+
+                with self.lock:
+                    if self.stop_event.is_set():
+                        return
+                    self.queued.append((episode, episode_url))
+                    self.video_player.append_video(stream_url)
+        except Exception as e:
+            logger.error(f"Error while queueing episodes for binge mode: {e}")
+        finally:
+            for future in futures.values():
+                future.cancel()
+
+    def result_or_retry(self, episode_number, future):
+        """
+        Returns the result of a resolution started in the background, the episode is resolved
+        once more if it failed.
+
+        Args:
+            episode_number (int): The episode number.
+            future (Future): The background resolution of the episode.
+
+        Returns:
+            tuple: The episode URL and the stream URL.
+
+        Raises:
+            Exception: If the episode could not be resolved twice in a row.
+        """
+        try:
+            return future.result()
+        except Exception as e:
+            if self.stop_event.is_set():
+                raise
+            logger.warning(f"Error while resolving episode {episode_number} for binge mode, retrying: {e}")
+            return self.resolve_episode(episode_number)
+
+    def handle_end_file(self, event):
+        """
+        Handles the end of a playlist entry: the tracker is updated and mpv starts the next entry.
+
+        Args:
+            event (dict): The end-file event sent by mpv.
+        """
+        reason = event.get("reason")
+        if reason == "redirect":
+            return
+        with self.lock:
+            if not self.queued:
+                return
+            episode, episode_url = self.queued.popleft()
+            self.last_episode = episode
+        self.slots.release()
+
+        if reason == "eof":
+            self.episode_tracker.update_anime(self.anime_name, episode)
+        elif reason == "error" and episode_url:
+            self.url_interactions.invalidate_stream(episode_url)
+        elif reason == "quit":
+            # The player was closed
+            self.stop()
+
+    def stop_queueing(self):
+        """ Stop resolving the next episodes, the episodes already queued keep playing. """
+        self.stop_event.set()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def stop(self):
+        """ Stop the binge session, the episode being played keeps playing. """
+        self.stop_queueing()
+        with self.lock:
+            self.video_player.disable_playlist()
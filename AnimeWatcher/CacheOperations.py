@@ -0,0 +1,139 @@
+from Config.logs_config import setup_logging
+from Config.config import AnimeWatcherConfig, CacheConfig
+import threading
+import time
+import json
+import os
+import re
+
+# Setup logging
+logger = setup_logging(AnimeWatcherConfig.ANIME_WATCH_LOG_FILENAME,
+                       AnimeWatcherConfig.ANIME_WATCH_LOG_PATH)
+
+
+class TTLCache:
+    def __init__(self, cache_file, default_ttl):
+        """
+        Initializes a disk-backed cache whose entries expire after a time-to-live.
+
+        Args:
+            cache_file (str): The path of the JSON file holding the cache.
+            default_ttl (int): The time-to-live of an entry in seconds, if no expiry is given.
+        """
+        self.cache_file = cache_file
+        self.default_ttl = default_ttl
+        self.lock = threading.Lock()
+        self.entries = self.read_cache_file()
+
+    def read_cache_file(self):
+        """
+        Read the cache file, dropping the expired entries.
+
+        Returns:
+            dict: The entries of the cache ({key: {'value': ..., 'expires_at': ...}}).
+        """
+        try:
+            with open(self.cache_file, 'r') as file:
+                entries = json.load(file)
+            now = time.time()
+            return {key: entry for key, entry in entries.items() if entry.get('expires_at', 0) > now}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, AttributeError) as e:
+            logger.error(f"Error reading cache file {self.cache_file}, starting with an empty cache: {e}")
+            return {}
+
+    def save_cache_file(self):
+        """ Save the cache file (written to a temporary file first so a crash can't corrupt it). """
+        try:
+            directory = os.path.dirname(self.cache_file)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            temp_file = f"{self.cache_file}.tmp"
+            with open(temp_file, 'w') as file:
+                json.dump(self.entries, file)
+            os.replace(temp_file, self.cache_file)
+        except Exception as e:
+            logger.error(f"Error saving cache file {self.cache_file}: {e}")
+
+    def get(self, key):
+        """
+        Get the value stored for the key.
+
+        Returns:
+            The value, or None if the key is not cached or expired.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry['expires_at'] <= time.time():
+                del self.entries[key]
+                return None
+            return entry['value']
+
+    def put(self, key, value, expires_at=None):
+        """
+        Store the value for the key.
+
+        Args:
+            key (str): The key.
+            value: The value (must be JSON serializable).
+            expires_at (float, optional): The expiry timestamp. Defaults to now + the default time-to-live.
+        """
+        with self.lock:
+            self.entries[key] = {
+                'value': value,
+                'expires_at': expires_at if expires_at else time.time() + self.default_ttl
+            }
+            self.save_cache_file()
+
+    def invalidate(self, key):
+        """ Remove the key from the cache. """
+        with self.lock:
+            if self.entries.pop(key, None) is not None:
+                self.save_cache_file()
+
+
+class StreamCache(TTLCache):
+    # Expiry timestamps found in signed stream URLs (e.g. ?expires=1700000000 or /exp=1700000000~)
+    EXPIRY_PATTERN = re.compile(r'(?:^|[?&/~;,])(?:expires|expire|expiry|exp|e)=(\d{10,13})(?=$|[&/~;,])', re.IGNORECASE)
+
+    def __init__(self):
+        """
+        Initializes the cache of the resolved streaming URLs, keyed by episode URL.
+        """
+        super().__init__(CacheConfig.STREAM_CACHE_FILE, CacheConfig.STREAM_DEFAULT_TTL)
+
+    def get_expiry(self, stream_url):
+        """
+        Get the expiry of a signed stream URL.
+
+        Args:
+            stream_url (str): The stream URL.
+
+        Returns:
+            float: The expiry timestamp (minus a safety margin), or None if the URL is not signed.
+        """
+        match = self.EXPIRY_PATTERN.search(stream_url)
+        if match is None:
+            return None
+        expires_at = int(match.group(1))
+        # Convert milliseconds to seconds
+        if expires_at > 10 ** 12:
+            expires_at /= 1000
+        return expires_at - CacheConfig.STREAM_EXPIRY_MARGIN
+
+    def put_stream(self, episode_url, stream_url):
+        """
+        Store the stream URL of an episode until the stream expires.
+
+        Args:
+            episode_url (str): The URL of the episode.
+            stream_url (str): The resolved stream URL.
+        """
+        expires_at = self.get_expiry(stream_url)
+        if expires_at is not None and expires_at <= time.time():
+            # Already expired (or about to), don't cache it
+            return
+        self.put(episode_url, stream_url, expires_at)
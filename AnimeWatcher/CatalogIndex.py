@@ -0,0 +1,312 @@
+from Config.logs_config import setup_logging
+from Config.config import AnimeFetcherConfig
+from AnimeWatcher.CatalogOperations import AnimeCatalog
+from AnimeWatcher.FileOperations import write_file_atomically
+from bisect import bisect_left
+from collections import Counter
+import threading
+import time
+import json
+import os
+
+# Setup logging
+logger = setup_logging(AnimeFetcherConfig.ANIME_FETCH_LOG_FILENAME,
+                       AnimeFetcherConfig.ANIME_FETCH_LOG_PATH)
+
+
+class CatalogIndex:
+    # Bumped when the layout of the index changes (the index is then rebuilt)
+    INDEX_VERSION = 2
+
+    def __init__(self, normalize, catalog_file=AnimeFetcherConfig.CATALOG_FILE,
+                 index_file=AnimeFetcherConfig.CATALOG_INDEX_FILE, max_age=AnimeFetcherConfig.CATALOG_MAX_AGE):
+        """
+        Initializes the indexes over the names (titles and alternate names) of the local catalog:
+        an inverted index (token -> animes whose names contain it) and a trigram index used for the
+        typo-tolerant matches (trigram -> names containing it).
+
+        The indexes are saved next to the catalog and only rebuilt when the records of the catalog change:
+        {'version': ..., 'catalog_mtime': ..., 'catalog_revision': ..., 'catalog_updated_at': ..., 'complete': bool,
+         'records': [{'title': ..., 'link': ..., 'episodes': ..., 'other_names': [...]}],
+         'names': [normalized_name, ...], 'name_records': [record_index, ...], 'name_starts': [name_index, ...],
+         'tokens': {token: [record_index, ...]}, 'trigrams': {trigram: [name_index, ...]}, 'trigram_counts': [...]}
+
+        Args:
+            normalize (callable): The normalization of the titles (AnimeInteractions.format_anime_name), tokens are split on '-'.
+            catalog_file (str, optional): The path of the catalog. Defaults to AnimeFetcherConfig.CATALOG_FILE.
+            index_file (str, optional): The path of the index. Defaults to AnimeFetcherConfig.CATALOG_INDEX_FILE.
+            max_age (int, optional): Seconds before the catalog is considered stale. Defaults to AnimeFetcherConfig.CATALOG_MAX_AGE.
+        """
+        self.normalize = normalize
+        self.catalog_file = catalog_file
+        self.index_file = index_file
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        self.data = None
+        # Sorted tokens, used for the prefix matches of the last query token
+        self.sorted_tokens = []
+
+    def tokenize(self, text):
+        """
+        Split a text into normalized tokens.
+
+        Returns:
+            list: The tokens.
+        """
+        return [token for token in self.normalize(text).split('-') if token]
+
+    def get_trigrams(self, normalized_name):
+        """
+        Get the trigrams of a normalized name (each word is padded so its start and end weigh more).
+
+        Returns:
+            set: The trigrams.
+        """
+        trigrams = set()
+        for word in filter(None, normalized_name.split('-')):
+            padded = f"  {word} "
+            trigrams.update(padded[position:position + 3] for position in range(len(padded) - 2))
+        return trigrams
+
+    def get_catalog_mtime(self):
+        """
+        Get the modification time of the catalog file, used to detect an index built from an older catalog.
+
+        Returns:
+            float: The modification timestamp, or None if the catalog file doesn't exist.
+        """
+        try:
+            return os.path.getmtime(self.catalog_file)
+        except OSError:
+            return None
+
+    def read_index_file(self):
+        """
+        Read the index file.
+
+        Returns:
+            dict: The index, or None if the file doesn't exist or is invalid.
+        """
+        try:
+            with open(self.index_file, 'r') as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.error(f"Error reading catalog index {self.index_file}, rebuilding it: {e}")
+            return None
+
+    def save(self, data):
+        """ Save the index. """
+        try:
+            write_file_atomically(self.index_file, json.dumps(data))
+        except Exception as e:
+            logger.error(f"Error saving catalog index {self.index_file}: {e}")
+
+    def set_catalog_state(self, data, catalog, catalog_mtime):
+        """
+        Copy the state of the catalog (freshness and completeness) into the index.
+        """
+        data['catalog_mtime'] = catalog_mtime
+        data['catalog_revision'] = catalog.data['revision']
+        data['catalog_updated_at'] = catalog.data.get('updated_at')
+        data['complete'] = catalog.is_complete()
+
+    def build(self, catalog, catalog_mtime):
+        """
+        Build the index from the catalog and save it.
+
+        Args:
+            catalog (AnimeCatalog): The catalog.
+            catalog_mtime (float): The modification time of the catalog file.
+
+        Returns:
+            dict: The index.
+        """
+        records = sorted(catalog.records(), key=lambda record: record.get('title') or '')
+        names, name_records, name_starts = [], [], []
+        tokens, trigrams, trigram_counts = {}, {}, []
+        for record_index, record in enumerate(records):
+            # The names of a record are contiguous, the title first
+            name_starts.append(len(names))
+            record_tokens = set()
+            for name in [record.get('title') or ''] + (record.get('other_names') or []):
+                name_tokens = self.tokenize(name)
+                normalized_name = '-'.join(name_tokens)
+                if not normalized_name or normalized_name in names[name_starts[-1]:]:
+                    continue
+                record_tokens.update(name_tokens)
+                name_trigrams = self.get_trigrams(normalized_name)
+                for trigram in name_trigrams:
+                    trigrams.setdefault(trigram, []).append(len(names))
+                trigram_counts.append(len(name_trigrams))
+                names.append(normalized_name)
+                name_records.append(record_index)
+            for token in record_tokens:
+                tokens.setdefault(token, []).append(record_index)
+
+        data = {
+            'version': self.INDEX_VERSION,
+            'records': records,
+            'names': names,
+            'name_records': name_records,
+            'name_starts': name_starts,
+            'tokens': tokens,
+            'trigrams': trigrams,
+            'trigram_counts': trigram_counts
+        }
+        self.set_catalog_state(data, catalog, catalog_mtime)
+        self.save(data)
+        logger.info(f"Catalog index built with {len(records)} animes, {len(names)} names and {len(tokens)} tokens")
+        return data
+
+    def load(self):
+        """
+        Load the index (once), rebuilding it if the records of the catalog changed since it was built
+        (a refresh that found nothing new only updates the freshness of the index).
+
+        Returns:
+            dict: The index, or None if there is no catalog.
+        """
+        with self.lock:
+            catalog_mtime = self.get_catalog_mtime()
+            if catalog_mtime is None:
+                return None
+            if self.data is not None and self.data.get('catalog_mtime') == catalog_mtime:
+                return self.data
+
+            data = self.read_index_file()
+            if data is None or data.get('version') != self.INDEX_VERSION or data.get('catalog_mtime') != catalog_mtime:
+                catalog = AnimeCatalog(self.catalog_file)
+                if data is not None and data.get('version') == self.INDEX_VERSION \
+                        and data.get('catalog_revision') == catalog.data['revision']:
+                    self.set_catalog_state(data, catalog, catalog_mtime)
+                    self.save(data)
+                else:
+                    data = self.build(catalog, catalog_mtime)
+            self.data = data
+            self.sorted_tokens = sorted(data['tokens'])
+            return self.data
+
+    def is_usable(self, data):
+        """
+        Check if the catalog is complete and not stale.
+        """
+        updated_at = data.get('catalog_updated_at')
+        return bool(data.get('complete')) and updated_at is not None and time.time() - updated_at < self.max_age
+
+    def prefix_postings(self, tokens, prefix):
+        """
+        Get the records containing a token starting with the prefix.
+
+        Returns:
+            set: The record indexes.
+        """
+        postings = set()
+        position = bisect_left(self.sorted_tokens, prefix)
+        while position < len(self.sorted_tokens) and self.sorted_tokens[position].startswith(prefix):
+            postings.update(tokens[self.sorted_tokens[position]])
+            position += 1
+        return postings
+
+    def record_names(self, data, record_index):
+        """
+        Get the normalized names of a record.
+        """
+        name_starts = data['name_starts']
+        end = name_starts[record_index + 1] if record_index + 1 < len(name_starts) else len(data['names'])
+        return data['names'][name_starts[record_index]:end]
+
+    def search(self, query):
+        """
+        Find the animes matching the query: the animes whose names contain every token of the query
+        (the last one may be incomplete), or the closest names if there is none (typos).
+
+        Args:
+            query (str): The anime name typed by the user.
+
+        Returns:
+            list: The matching animes (title, link, episode count and alternate names), best matches first,
+                or None if the catalog can't answer (no catalog, stale catalog or no match).
+        """
+        data = self.load()
+        if data is None or not self.is_usable(data):
+            return None
+        query_tokens = self.tokenize(query)
+        if not query_tokens:
+            return None
+        return self.search_tokens(data, query_tokens) or self.search_fuzzy(data, '-'.join(query_tokens))
+
+    def search_tokens(self, data, query_tokens):
+        """
+        Find the animes whose names contain every token of the query (the last one may be incomplete).
+
+        Returns:
+            list: The matching animes, best matches first, or None if there is no match.
+        """
+        tokens = data['tokens']
+        postings = []
+        for token in query_tokens[:-1]:
+            if token not in tokens:
+                return None
+            postings.append(set(tokens[token]))
+        postings.append(self.prefix_postings(tokens, query_tokens[-1]))
+
+        # Intersect from the rarest token
+        postings.sort(key=len)
+        matches = postings[0].intersection(*postings[1:])
+        if not matches:
+            return None
+
+        normalized_query = '-'.join(query_tokens)
+        records = data['records']
+
+        def rank(record_index):
+            names = self.record_names(data, record_index)
+            # Exact name first, then names starting with the query, then the shortest titles
+            return (normalized_query not in names, not any(name.startswith(normalized_query) for name in names),
+                    len(names[0]) if names else 0, record_index)
+
+        return [dict(records[record_index]) for record_index in sorted(matches, key=rank)]
+
+    def search_fuzzy(self, data, normalized_query, min_similarity=AnimeFetcherConfig.FUZZY_MIN_SIMILARITY,
+                     max_results=AnimeFetcherConfig.FUZZY_MAX_RESULTS):
+        """
+        Find the animes whose names are the closest to the query (Jaccard similarity of the trigrams).
+
+        Args:
+            data (dict): The index.
+            normalized_query (str): The normalized query.
+            min_similarity (float, optional): The minimum similarity of a match. Defaults to AnimeFetcherConfig.FUZZY_MIN_SIMILARITY.
+            max_results (int, optional): The maximum number of matches. Defaults to AnimeFetcherConfig.FUZZY_MAX_RESULTS.
+
+        Returns:
+            list: The matching animes, most similar first, or None if there is no match.
+        """
+        query_trigrams = self.get_trigrams(normalized_query)
+        if not query_trigrams:
+            return None
+
+        # Number of trigrams shared by the query and each name
+        shared_counts = Counter()
+        trigrams = data['trigrams']
+        for trigram in query_trigrams:
+            shared_counts.update(trigrams.get(trigram, ()))
+
+        # similarity <= shared / len(query_trigrams), so the names sharing too few trigrams can be skipped
+        min_shared = min_similarity * len(query_trigrams)
+        trigram_counts = data['trigram_counts']
+        name_records = data['name_records']
+        best_similarities = {}
+        for name_index, shared in shared_counts.items():
+            if shared < min_shared:
+                continue
+            similarity = shared / (len(query_trigrams) + trigram_counts[name_index] - shared)
+            record_index = name_records[name_index]
+            if similarity >= min_similarity and similarity > best_similarities.get(record_index, 0):
+                best_similarities[record_index] = similarity
+
+        if not best_similarities:
+            return None
+        ranked = sorted(best_similarities, key=lambda record_index: (-best_similarities[record_index], record_index))
+        return [dict(data['records'][record_index]) for record_index in ranked[:max_results]]
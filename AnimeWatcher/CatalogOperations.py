@@ -0,0 +1,175 @@
+from Config.logs_config import setup_logging
+from Config.config import AnimeFetcherConfig
+from AnimeWatcher.FileOperations import write_file_atomically
+import threading
+import time
+import json
+
+# Setup logging
+logger = setup_logging(AnimeFetcherConfig.ANIME_FETCH_LOG_FILENAME,
+                       AnimeFetcherConfig.ANIME_FETCH_LOG_PATH)
+
+
+class AnimeCatalog:
+    def __init__(self, catalog_file=AnimeFetcherConfig.CATALOG_FILE):
+        """
+        Initializes the local catalog of the animes (titles, links and episode counts).
+
+        The file also holds the progress of the crawl so an interrupted crawl can resume, and the validators
+        of each page so a refresh only re-parses the pages that changed:
+        {'updated_at': ..., 'complete': bool, 'crawl_started_at': ..., 'revision': int (bumped when a record changes),
+         'pages': {page_number: {'links': [...], 'checked_at': ..., 'etag': ..., 'last_modified': ..., 'hash': ...}},
+         'animes': {link: {'title': ..., 'link': ..., 'episodes': int or None, 'other_names': [...]}}}
+
+        Args:
+            catalog_file (str, optional): The path of the JSON file. Defaults to AnimeFetcherConfig.CATALOG_FILE.
+        """
+        self.catalog_file = catalog_file
+        self.lock = threading.Lock()
+        self.data = self.read_catalog_file()
+
+    def read_catalog_file(self):
+        """
+        Read the catalog file.
+
+        Returns:
+            dict: The catalog, empty if the file doesn't exist or is invalid.
+        """
+        empty_catalog = {'updated_at': None, 'complete': False, 'crawl_started_at': 0, 'revision': 0, 'pages': {}, 'animes': {}}
+        try:
+            with open(self.catalog_file, 'r') as file:
+                data = json.load(file)
+            return {**empty_catalog, **data}
+        except FileNotFoundError:
+            return empty_catalog
+        except (OSError, ValueError, TypeError) as e:
+            logger.error(f"Error reading catalog file {self.catalog_file}, starting with an empty catalog: {e}")
+            return empty_catalog
+
+    def save(self):
+        """ Save the catalog (checkpoint of the crawl). """
+        with self.lock:
+            self.data['updated_at'] = time.time()
+            content = json.dumps(self.data)
+        try:
+            write_file_atomically(self.catalog_file, content)
+        except Exception as e:
+            logger.error(f"Error saving catalog file {self.catalog_file}: {e}")
+
+    def start_crawl(self):
+        """
+        Start a new crawl (refresh) if the previous one is complete, otherwise the interrupted crawl is resumed.
+        """
+        with self.lock:
+            if self.data['complete']:
+                self.data['complete'] = False
+                self.data['crawl_started_at'] = time.time()
+
+    def is_page_done(self, page_number):
+        """
+        Check if a page of the anime list was already checked during the current crawl.
+        """
+        with self.lock:
+            page = self.data['pages'].get(str(page_number))
+            return page is not None and page.get('checked_at', 0) >= self.data['crawl_started_at']
+
+    def get_page(self, page_number):
+        """
+        Get the stored state of a page of the anime list.
+
+        Returns:
+            dict: The links and validators of the page, or None if the page was never fetched.
+        """
+        with self.lock:
+            page = self.data['pages'].get(str(page_number))
+            return dict(page) if page else None
+
+    def mark_page_checked(self, page_number):
+        """
+        Mark a page of the anime list as checked (unchanged since the last crawl).
+        """
+        with self.lock:
+            self.data['pages'][str(page_number)]['checked_at'] = time.time()
+
+    def set_page(self, page_number, animes, etag=None, last_modified=None, content_hash=None):
+        """
+        Store the animes listed on a page of the anime list, only the new or renamed animes are updated.
+
+        Args:
+            page_number (int): The page number.
+            animes (list): The dictionaries containing the title and link of each anime.
+            etag (str, optional): The ETag of the page. Defaults to None.
+            last_modified (str, optional): The Last-Modified date of the page. Defaults to None.
+            content_hash (str, optional): The hash of the page content. Defaults to None.
+
+        Returns:
+            int: The number of records added or updated.
+        """
+        with self.lock:
+            self.data['pages'][str(page_number)] = {
+                'links': [anime['link'] for anime in animes],
+                'checked_at': time.time(),
+                'etag': etag,
+                'last_modified': last_modified,
+                'hash': content_hash
+            }
+            changed = 0
+            for anime in animes:
+                record = self.data['animes'].get(anime['link'])
+                if record is not None and record.get('title') == anime['title']:
+                    continue
+                if record is None:
+                    record = self.data['animes'][anime['link']] = {'link': anime['link'], 'episodes': None}
+                record['title'] = anime['title']
+                changed += 1
+            if changed:
+                self.data['revision'] += 1
+            return changed
+
+    def pending_details(self):
+        """
+        Get the links of the animes whose episode count is not known yet.
+        """
+        with self.lock:
+            return [link for link, record in self.data['animes'].items() if record.get('episodes') is None]
+
+    def set_details(self, link, details):
+        """
+        Store the details of an anime (episode count and alternate names).
+
+        Args:
+            link (str): The link of the anime.
+            details (dict): The details to store ('episodes', 'other_names').
+        """
+        with self.lock:
+            record = self.data['animes'].get(link)
+            if record is not None and any(record.get(key) != value for key, value in details.items()):
+                record.update(details)
+                self.data['revision'] += 1
+
+    def mark_complete(self):
+        """
+        Mark the crawl as complete (the next crawl is a refresh).
+        """
+        with self.lock:
+            self.data['complete'] = True
+
+    def is_complete(self):
+        """
+        Check if a full crawl of the anime list was completed.
+
+        Returns:
+            bool: True if the catalog holds the full anime list, False if the crawl is still to finish.
+        """
+        with self.lock:
+            return self.data['complete']
+
+    def records(self):
+        """
+        Get the animes of the catalog.
+
+        Returns:
+            list: The dictionaries containing the title, link, episode count and alternate names of each anime.
+        """
+        with self.lock:
+            return [dict(record) for record in self.data['animes'].values()]
@@ -13,6 +13,7 @@ class Menu:
     NextEpisode = 'n'
     PreviousEpisode = 'p'
     ChangeAnime = 'c'
+    Binge = 'b'
     Quit = 'q'
     
 class EpisodeMenu:
@@ -43,6 +44,7 @@ class EpisodeMenu:
             "===== Menu =====\n"
             f"{self.color.green}[N] Next Episode{self.color.endc}\n"
             f"{self.color.yellow}[P] Previous Episode{self.color.endc}\n"
+            f"{self.color.green}[B] Binge (play the next episodes automatically){self.color.endc}\n"
             f"{self.color.orange}[C] Change Anime{self.color.endc}\n"
             f"{self.color.red}[Q] Quit{self.color.endc}\n"
             )
@@ -61,6 +63,7 @@ class EpisodeMenu:
         - The previous episode if user_choice is 'p'.
         - None if user_choice is 'q'.
         - False if user_choice is 'c'.
+        - Menu.Binge if user_choice is 'b'.
         - The current episode if user_choice is invalid.
         """
         # Handle the user's choice        
@@ -77,6 +80,9 @@ class EpisodeMenu:
             # If the user enters 'c', return False to change the anime
             case Menu.ChangeAnime:
                 return Menu.ChangeAnime
+            # If the user enters 'b', return Binge to queue the next episodes
+            case Menu.Binge:
+                return Menu.Binge
             case _:
                 print(f"Invalid choice. Please enter one of the following: {', '.join(self.available_choices())}.")
                 return current_episode
@@ -114,4 +120,4 @@ class EpisodeMenu:
         Returns:
             list: A list of the available choices for the user.
         """
-        return [Menu.NextEpisode, Menu.PreviousEpisode, Menu.ChangeAnime, Menu.Quit]
+        return [Menu.NextEpisode, Menu.PreviousEpisode, Menu.Binge, Menu.ChangeAnime, Menu.Quit]
@@ -0,0 +1,174 @@
+from bisect import bisect_right
+
+
+class EpisodeRanges:
+    def __init__(self, ranges=()):
+        """
+        Initializes a compact set of episode numbers stored as sorted, disjoint ranges
+        (e.g. episodes 1 to 1050 and 1052 are two ranges instead of 1051 integers).
+
+        Args:
+            ranges (iterable, optional): Sorted, disjoint (start, end) tuples (inclusive). Defaults to no range.
+        """
+        # Two parallel lists so the lookups can bisect on the starts
+        self.starts = []
+        self.ends = []
+        for start, end in ranges:
+            self.add_range(start, end)
+
+    @classmethod
+    def from_episodes(cls, episodes):
+        """
+        Create the ranges from episode numbers (in any order).
+
+        Args:
+            episodes (iterable): The episode numbers.
+
+        Returns:
+            EpisodeRanges: The ranges of the episodes.
+        """
+        episode_ranges = cls()
+        for episode in sorted(set(episodes)):
+            # The episodes are sorted, so they can only extend the last range
+            if episode_ranges.ends and episode_ranges.ends[-1] + 1 == episode:
+                episode_ranges.ends[-1] = episode
+            else:
+                episode_ranges.starts.append(episode)
+                episode_ranges.ends.append(episode)
+        return episode_ranges
+
+    @classmethod
+    def from_string(cls, text):
+        """
+        Create the ranges from their compact string form (e.g. "1-1050,1052").
+
+        Args:
+            text (str): The compact string form.
+
+        Returns:
+            EpisodeRanges: The parsed ranges.
+        """
+        episode_ranges = cls()
+        for part in filter(None, (part.strip() for part in text.split(','))):
+            start, _, end = part.partition('-')
+            episode_ranges.add_range(int(start), int(end) if end else int(start))
+        return episode_ranges
+
+    def to_string(self):
+        """
+        Get the compact string form of the ranges (e.g. "1-1050,1052").
+        """
+        return ','.join(str(start) if start == end else f"{start}-{end}" for start, end in self.ranges())
+
+    def ranges(self):
+        """
+        Get the ranges as (start, end) tuples (inclusive).
+        """
+        return list(zip(self.starts, self.ends))
+
+    def find_range(self, episode):
+        """
+        Get the index of the range that may contain the episode (the last range starting at or before it).
+
+        Returns:
+            int: The index of the range, -1 if the episode is before every range.
+        """
+        return bisect_right(self.starts, episode) - 1
+
+    def __contains__(self, episode):
+        index = self.find_range(episode)
+        return index >= 0 and episode <= self.ends[index]
+
+    def __len__(self):
+        return sum(end - start + 1 for start, end in zip(self.starts, self.ends))
+
+    def __iter__(self):
+        for start, end in zip(self.starts, self.ends):
+            yield from range(start, end + 1)
+
+    def __eq__(self, other):
+        return isinstance(other, EpisodeRanges) and self.starts == other.starts and self.ends == other.ends
+
+    def __repr__(self):
+        return f"EpisodeRanges('{self.to_string()}')"
+
+    def add(self, episode):
+        """
+        Add an episode.
+
+        Returns:
+            bool: True if the episode was added, False if it was already in the ranges.
+        """
+        if episode in self:
+            return False
+        self.add_range(episode, episode)
+        return True
+
+    def add_range(self, start, end):
+        """
+        Add the episodes from start to end (inclusive), merging the overlapping and adjacent ranges.
+        """
+        # First range that could touch the new one (ends at start - 1 or later)
+        first = max(self.find_range(start), 0)
+        if first < len(self.ends) and self.ends[first] < start - 1:
+            first += 1
+        # Ranges touching the new one (start at end + 1 or earlier)
+        last = first
+        while last < len(self.starts) and self.starts[last] <= end + 1:
+            last += 1
+
+        if first < last:
+            start = min(start, self.starts[first])
+            end = max(end, self.ends[last - 1])
+        self.starts[first:last] = [start]
+        self.ends[first:last] = [end]
+
+    def unwatched_ranges(self, start, end):
+        """
+        Get the ranges of episodes between start and end (inclusive) that are not in the ranges.
+
+        Returns:
+            list: The missing (start, end) tuples.
+        """
+        missing = []
+        current = start
+        index = max(self.find_range(start), 0)
+        while current <= end and index < len(self.starts):
+            if self.ends[index] < current:
+                index += 1
+                continue
+            if self.starts[index] > end:
+                break
+            if self.starts[index] > current:
+                missing.append((current, self.starts[index] - 1))
+            current = self.ends[index] + 1
+            index += 1
+        if current <= end:
+            missing.append((current, end))
+        return missing
+
+    def unwatched_in_range(self, start, end):
+        """
+        Get the episodes between start and end (inclusive) that are not in the ranges.
+
+        Returns:
+            list: The missing episode numbers.
+        """
+        return [episode for missing_start, missing_end in self.unwatched_ranges(start, end)
+                for episode in range(missing_start, missing_end + 1)]
+
+    def next_unwatched(self, after):
+        """
+        Get the first episode after the given one that is not in the ranges.
+
+        Args:
+            after (int): The episode to start from (excluded).
+
+        Returns:
+            int: The next missing episode number.
+        """
+        episode = after + 1
+        index = self.find_range(episode)
+        if index >= 0 and episode <= self.ends[index]:
+            return self.ends[index] + 1
+        return episode
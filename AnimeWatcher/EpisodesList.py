@@ -1,121 +1,360 @@
 # The user will be able to naviguate through the animes/episodes and select the one they want to watch.
 import curses 
+import queue
+import re
 from Config.logs_config import setup_logging
 from Config.config import AnimeWatcherConfig
-from AnimeWatcher.TrackerOperations import EpisodeTracker
 # Setup logging
 logger = setup_logging(AnimeWatcherConfig.ANIME_WATCH_LOG_FILENAME,AnimeWatcherConfig.ANIME_WATCH_LOG_PATH)
 
-def displayAnimes(stdscr, anime, cursor):
-    try:
-        stdscr.clear()  # Clear the console
-        stdscr.addstr(0, 0, f"Select an anime to watch: (1-{len(anime)})\n")
-
-        # Get screen dimensions
-        height, width = stdscr.getmaxyx()
-
-        # Calculate the range of episodes to display
-        display_range = min(20, height - 2)  # Ensure we don't try to display more lines than the screen can fit
-        start = max(0, cursor - display_range // 2)
-        end = min(start + display_range, len(anime))
-        if end - start < display_range:  # Adjust start if end is at the end of the list
-            start = max(0, end - display_range)
-        for i in range(start, end):
-            ani = anime[i]
-            line = f"> {i + 1}. {ani['title']}\n" if i == cursor else f"  {i + 1}. {ani['title']}\n"
-            if len(line) > width:
-                line = line[:width - 1]  # Truncate the line if it's too long
-            try:
-                stdscr.addstr(i - start + 1, 0, line, curses.A_REVERSE if i == cursor else 0)  # Highlight the selected episode
-            except curses.error:
-                logger.error(f"Error displaying anime list: {line}")
-                raise Exception("Error displaying anime list")
-        stdscr.refresh()
-    except Exception as e:
-        logger.error(f"Error displaying anime list: {e}")
-        raise e
+class VirtualList:
+    def __init__(self, stdscr, items, title, render_row, max_rows=20):
+        """
+        Initializes a list widget that only renders the visible rows and only repaints the rows that changed
+        (the screen is never cleared, so scrolling through long lists doesn't flicker).
+
+        Args:
+            stdscr (curses.window): The curses window.
+            items (sequence): The items of the list (only the visible ones are read).
+            title (str): The title of the list, formatted with the number of items.
+            render_row (callable): Called with the items, the index of a row and whether it is selected,
+                returns the text and the curses attributes of the row.
+            max_rows (int, optional): The maximum number of rows displayed. Defaults to 20.
+        """
+        self.stdscr = stdscr
+        self.items = items
+        self.title = title
+        self.render_row = render_row
+        self.max_rows = max_rows
+        # The text and attributes displayed on each screen line
+        self.screen_lines = {}
+        # Index of the first visible item
+        self.start = 0
+        # Displayed after the title (e.g. the filter being typed)
+        self.subtitle = ""
+
+    def visible_range(self, cursor, height):
+        """
+        Get the range of the items to display. The window only scrolls when the cursor leaves it,
+        so moving the cursor inside the window only repaints two rows.
+
+        Returns:
+            tuple: The start (inclusive) and end (exclusive) indexes.
+        """
+        display_range = max(1, min(self.max_rows, height - 2))  # Ensure we don't try to display more lines than the screen can fit
+        if cursor < self.start:
+            self.start = cursor
+        elif cursor >= self.start + display_range:
+            self.start = cursor - display_range + 1
+        end = min(self.start + display_range, len(self.items))
+        if end - self.start < display_range:  # Adjust start if end is at the end of the list
+            self.start = max(0, end - display_range)
+        return self.start, end
+
+    def paint(self, line, text, attributes=0):
+        """
+        Display a screen line, unless it is already displayed.
+        """
+        if self.screen_lines.get(line) == (text, attributes):
+            return
+        try:
+            self.stdscr.addstr(line, 0, text, attributes)
+            self.stdscr.clrtoeol()
+        except curses.error:
+            logger.error(f"Error displaying list line: {text}")
+            raise Exception("Error displaying list")
+        self.screen_lines[line] = (text, attributes)
+
+    def draw(self, cursor):
+        """
+        Display the visible rows, only the rows that changed are repainted.
+
+        Args:
+            cursor (int): The index of the selected item.
+        """
+        height, width = self.stdscr.getmaxyx()
+        self.paint(0, (self.title.format(len(self.items)) + self.subtitle)[:width - 1])
+
+        start, end = self.visible_range(cursor, height)
+        for line, index in enumerate(range(start, end), start=1):
+            text, attributes = self.render_row(self.items, index, index == cursor)
+            self.paint(line, text[:width - 1], attributes)
+
+        # Erase the lines that are not used anymore (e.g. after a resize)
+        for line in [line for line in self.screen_lines if line > end - start]:
+            self.stdscr.move(line, 0)
+            self.stdscr.clrtoeol()
+            del self.screen_lines[line]
+
+        self.stdscr.noutrefresh()
+        curses.doupdate()
+
+    def reset(self):
+        """ Clear the screen, every row is repainted on the next draw (e.g. after a resize). """
+        self.screen_lines.clear()
+        self.stdscr.clear()
+
+
+class ListFilter:
+    def __init__(self, items):
+        """
+        Initializes the type-to-filter index of a list of animes: the titles are lowercased and split into
+        tokens once, an anime matches if every token of the query starts one of its title tokens.
+
+        Args:
+            items (list): The animes (extended in place while the search pages are being fetched).
+        """
+        self.items = items
+        # ' ' + the lowercase title tokens of each item, so ' ' + token is a token prefix match
+        self.search_texts = []
+        # The query and matching indexes after each typed character (a backspace pops the last one)
+        self.history = [("", [])]
+        self.view = FilteredView(self)
+        self.sync()
+
+    @property
+    def query(self):
+        return self.history[-1][0]
+
+    @property
+    def indexes(self):
+        return self.history[-1][1]
+
+    def get_tokens(self, text):
+        return re.findall(r'[a-z0-9]+', text.lower())
+
+    def matches(self, search_text, query_tokens):
+        return all(f" {token}" in search_text for token in query_tokens)
+
+    def sync(self):
+        """
+        Index the items appended since the last call and add the matching ones to the results.
+        """
+        for index in range(len(self.search_texts), len(self.items)):
+            search_text = " " + " ".join(self.get_tokens(self.items[index]['title']))
+            self.search_texts.append(search_text)
+            for query, indexes in self.history:
+                if self.matches(search_text, self.get_tokens(query)):
+                    indexes.append(index)
+
+    def push(self, character):
+        """
+        Add a character to the query. The new query can only narrow the results, so only the current
+        matches are checked.
+        """
+        query = self.query + character
+        query_tokens = self.get_tokens(query)
+        self.history.append((query, [index for index in self.indexes
+                                     if self.matches(self.search_texts[index], query_tokens)]))
+
+    def pop(self):
+        """ Remove the last character of the query. """
+        if len(self.history) > 1:
+            self.history.pop()
+
+    def clear(self):
+        """ Remove the query. """
+        del self.history[1:]
+
+    def get_original_index(self, position):
+        """
+        Get the index in the full list of the item displayed at the given position.
+        """
+        return self.indexes[position]
+
+
+class FilteredView:
+    def __init__(self, list_filter):
+        """
+        Initializes the sequence of the items matching the filter (the items are not copied).
+        """
+        self.list_filter = list_filter
+
+    def __len__(self):
+        return len(self.list_filter.indexes)
+
+    def __getitem__(self, position):
+        return self.list_filter.items[self.list_filter.indexes[position]]
+
+    def get_original_index(self, position):
+        return self.list_filter.get_original_index(position)
+
+
+def anime_row(animes, index, selected):
+    """
+    Get the text and attributes of a row of the anime list (numbered by position in the full list).
+    """
+    number = animes.get_original_index(index) + 1 if isinstance(animes, FilteredView) else index + 1
+    text = f"{'> ' if selected else '  '}{number}. {animes[index]['title']}"
+    return text, curses.A_REVERSE if selected else 0  # Highlight the selected anime
 
-    
-def get_number_of_displays(anime):
-    if len(anime) < 20:
-        return len(anime)
-    return 20
 
 def setup_colors():
     curses.start_color()
     curses.init_pair(1, curses.COLOR_GREEN, curses.COLOR_BLACK)
     curses.init_pair(2, curses.COLOR_RED, curses.COLOR_BLACK)
-    
-def displayEpisodes(stdscr, episodes, cursor):
-    try:
-        setup_colors()  # Setup colors for red and green
-        stdscr.clear()  # Clear the console
-        
-        stdscr.addstr(0, 0, f"Select an episode to watch: (1-{len(episodes)})\n")
-    
-        # Calculate the maximum index to display
-        display_range = 20
-        start = max(0, cursor - display_range // 2)
-        end = min(start + display_range, len(episodes))
-
-        if (end - start) < display_range:  # Adjust start if end is at the end of the list
-            start = max(0, end - display_range)
-
-        # Print the episodes within the range
-        for i in range(start, end):
-            if (i == cursor):
-                color_pair = curses.color_pair(1) | curses.A_REVERSE  if episodes[i]['watched'] else curses.color_pair(2) | curses.A_REVERSE
-            else:
-                color_pair = curses.color_pair(1) if episodes[i]['watched'] else curses.color_pair(2)
-            
-            stdscr.addstr(f"{'> ' if (i == cursor) else '  '}{episodes[i]['episode']}\n", color_pair)
 
-        stdscr.refresh()
 
-    except Exception as e:
-        logger.error(f"Error displaying episodes list: {e}")
-        raise e
+def get_watched_status(max_episode, watched_episodes):
+    """
+    Get the watched status of every episode, for O(1) lookups while rendering.
+
+    Args:
+        max_episode (int): The last episode.
+        watched_episodes (EpisodeRanges): The watched episodes, None if the anime is not tracked.
+
+    Returns:
+        bytearray: 1 at the index of each watched episode, 0 otherwise.
+    """
+    status = bytearray(max_episode + 1)
+    for start, end in (watched_episodes.ranges() if watched_episodes else []):
+        start, end = max(start, 1), min(end, max_episode)
+        if start <= end:
+            status[start:end + 1] = b'\x01' * (end - start + 1)
+    return status
+
+
+def episode_row_renderer(status):
+    """
+    Get the renderer of the rows of the episode list (watched episodes in green, the others in red).
+
+    Args:
+        status (bytearray): The watched status of every episode.
 
-def animeList(animes):
+    Returns:
+        callable: The row renderer.
+    """
+    def episode_row(episodes, index, selected):
+        episode = episodes[index]
+        attributes = curses.color_pair(1) if status[episode] else curses.color_pair(2)
+        return f"{'> ' if selected else '  '}{episode}", attributes | curses.A_REVERSE if selected else attributes
+    return episode_row
+
+
+def animeList(animes, pending=None):
     try:
-        return curses.wrapper(curses_anime_list, animes, displayAnimes)
+        # Built once, then extended with the pages still being fetched
+        list_filter = ListFilter(animes)
+        return curses.wrapper(curses_anime_list, animes, lambda stdscr: VirtualList(
+            stdscr, list_filter.view, "Select an anime to watch: (1-{})", anime_row), pending, list_filter)
     except Exception as e:
         logger.error(f"Error selecting anime: {e}")
         raise e
-def episodesList(max_episode, watched_list):
-    try:        
-        return curses.wrapper(curses_anime_list, [{'episode': i, 'watched': i in watched_list} for i in range(1, max_episode + 1)], displayEpisodes)
+def episodesList(max_episode, watched_episodes):
+    try:
+        # The episodes are never materialized, the rows read the episode numbers and the watched status by index
+        episodes = range(1, max_episode + 1)
+        status = get_watched_status(max_episode, watched_episodes)
+
+        def create_list(stdscr):
+            setup_colors()  # Setup colors for red and green (once)
+            return VirtualList(stdscr, episodes, "Select an episode to watch: (1-{})", episode_row_renderer(status))
+
+        return curses.wrapper(curses_anime_list, episodes, create_list)
     except Exception as e:
         logger.error(f"Error selecting episode: {e}")
         raise e
 
-def curses_anime_list(stdscr, animes, function):
+def curses_anime_list(stdscr, animes, create_list, pending=None, list_filter=None):
     try:
         cursor = 0 
-        function(stdscr, animes, cursor)
+        # True while a filter is being typed ('/' to start, Esc to leave)
+        filtering = False
+        # The displayed items (only the matching animes if there is a filter)
+        items = list_filter.view if list_filter else animes
+        if list_filter and hasattr(curses, 'set_escdelay'):
+            curses.set_escdelay(25)  # Don't wait a second after Esc
+        display = create_list(stdscr)
+        display.draw(cursor)
         
         while True:
+            # Poll for new results while pages are still being fetched, otherwise block on the next key
+            stdscr.timeout(100 if pending is not None else -1)
             c = stdscr.getch()
+            if c == -1:
+                if pending is not None:
+                    pending = receive_pending_items(pending, animes)
+                    if list_filter:
+                        list_filter.sync()
+                    display.draw(cursor)
+                continue
             # Check for arrow key input
             if c == curses.KEY_UP and cursor > 0:
                 cursor -= 1  # Move the cursor up                         
-            elif c == curses.KEY_DOWN and cursor < len(animes) - 1:
+            elif c == curses.KEY_DOWN and cursor < len(items) - 1:
                 cursor += 1  # Move the cursor down
             elif c == ord('\n'):  # The curses library uses '\n' instead of 'enter'
-                return cursor + 1  # Return the selected index
+                if not items:
+                    continue
+                # Return the selected index (in the full list)
+                return (list_filter.get_original_index(cursor) if list_filter else cursor) + 1
+            elif c == curses.KEY_RESIZE:
+                display.reset()
+            elif filtering:
+                filtering, cursor = handle_filter_key(c, list_filter, cursor)
+                display.subtitle = f"  Filter: {list_filter.query}_" if filtering else ""
+            elif c == ord('/') and list_filter:
+                filtering = True
+                display.subtitle = "  Filter: _"
             elif c == ord('q'):
                 return 0
             elif ord('0') <= c <= ord('9'):
                 num_str = handle_number_input(stdscr, c)
-                cursor = update_cursor(num_str, len(animes))
+                cursor = update_cursor(num_str, len(items))
             
-            function(stdscr, animes, cursor)
+            display.draw(cursor)
     
     except Exception as e:
         logger.error(f"Error in curses anime list: {e}")
         raise e
 
 
+def handle_filter_key(c, list_filter, cursor):
+    """
+    Handles a key typed while filtering the list (the filter never triggers a new search).
+
+    Args:
+        c (int): The key.
+        list_filter (ListFilter): The filter of the list.
+        cursor (int): The position of the cursor in the filtered list.
+
+    Returns:
+        tuple: Whether the filter is still being typed, and the new position of the cursor.
+    """
+    if c == 27:  # Esc: remove the filter, the cursor stays on the same anime
+        original_index = list_filter.get_original_index(cursor) if list_filter.indexes else 0
+        list_filter.clear()
+        return False, original_index
+    if c in (curses.KEY_BACKSPACE, 127, 8):
+        list_filter.pop()
+        return True, 0
+    if 32 <= c <= 126:
+        list_filter.push(chr(c))
+        return True, 0
+    return True, cursor
+
+
+def receive_pending_items(pending, items):
+    """
+    Appends the items received from the queue to the displayed list.
+
+    Args:
+        pending (queue.Queue): Queue of item lists, None marks the end of the results.
+        items (list): The displayed list (extended in place).
+
+    Returns:
+        queue.Queue: The queue, or None once all the items were received.
+    """
+    while True:
+        try:
+            new_items = pending.get_nowait()
+        except queue.Empty:
+            return pending
+        if new_items is None:
+            return None
+        items.extend(new_items)
+
+
 def handle_number_input(stdscr, initial_char):
     num_str = chr(initial_char)  # Initialize the string with the first character
     display_number_input(stdscr, num_str)
@@ -130,6 +369,9 @@ def handle_number_input(stdscr, initial_char):
             break  # Exit the loop if the entered character is not a number
     
     stdscr.timeout(-1)  # Disable timeout after a multi-digit number is entered
+    # Erase the entered number (the list is not cleared when it is redrawn)
+    stdscr.move(stdscr.getmaxyx()[0] - 1, 0)
+    stdscr.clrtoeol()
     return num_str
 
 
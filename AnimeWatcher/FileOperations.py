@@ -0,0 +1,25 @@
+import tempfile
+import os
+
+
+def write_file_atomically(path, content):
+    """
+    Write a file through a temporary file that is synced to disk and then renamed over the original,
+    so a crash can never leave a partially written file.
+
+    Args:
+        path (str): The path of the file.
+        content (str): The content of the file.
+    """
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    file_descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path), suffix='.tmp')
+    try:
+        with os.fdopen(file_descriptor, 'w') as file:
+            file.write(content)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
@@ -0,0 +1,125 @@
+from Config.logs_config import setup_logging
+from Config.config import AnimeWatcherConfig, WebOperationsConfig, PrefetchConfig
+from AnimeWatcher.UrlOperations import UrlInteractions
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+# Setup logging
+logger = setup_logging(AnimeWatcherConfig.ANIME_WATCH_LOG_FILENAME,
+                       AnimeWatcherConfig.ANIME_WATCH_LOG_PATH)
+
+
+class EpisodePrefetcher:
+    def __init__(self, anime_interactions, stream_cache=None):
+        """
+        Initializes the prefetcher resolving the adjacent episodes in the background while the current one plays.
+
+        Args:
+            anime_interactions (AnimeInteractions): Used to format the episode links.
+            stream_cache (StreamCache, optional): The cache of the resolved stream URLs. Defaults to None.
+        """
+        self.anime_interactions = anime_interactions
+        # Use a separate session so the prefetch doesn't compete with the foreground requests
+        self.url_interactions = UrlInteractions(WebOperationsConfig.QUALITY, stream_cache)
+        self.executor = ThreadPoolExecutor(max_workers=PrefetchConfig.MAX_WORKERS)
+        self.lock = threading.Lock()
+        # The anime being prefetched and the prefetches in flight ({episode_number: future})
+        self.anime_url = None
+        self.futures = {}
+
+    def resolve_episode(self, url, anime_name, episode_number):
+        """
+        Resolves the episode link and stream URL of an episode.
+
+        Returns:
+            tuple: The episode URL and the stream URL.
+        """
+        episode_url = self.anime_interactions.format_episode_link(url, anime_name, episode_number)
+        return episode_url, self.url_interactions.get_streaming_url(episode_url)
+
+    def get_targets(self, current_episode, start_episode, max_episode):
+        """
+        Get the episodes to prefetch around the current episode (the next one, and the previous one if enabled).
+        """
+        targets = [current_episode + 1]
+        if PrefetchConfig.PREFETCH_PREVIOUS:
+            targets.append(current_episode - 1)
+        return [episode for episode in targets if start_episode <= episode <= max_episode]
+
+    def prefetch(self, url, anime_name, current_episode, start_episode, max_episode):
+        """
+        Starts resolving the episodes adjacent to the one being played.
+
+        Args:
+            url (str): The URL of the anime.
+            anime_name (str): The name of the anime.
+            current_episode (int): The episode being played.
+            start_episode (int): The first episode available.
+            max_episode (int): The last episode available.
+        """
+        with self.lock:
+            if url != self.anime_url:
+                self.cancel_futures()
+                self.anime_url = url
+
+            targets = self.get_targets(current_episode, start_episode, max_episode)
+            # Drop the prefetches that are not adjacent anymore
+            for episode_number in list(self.futures):
+                if episode_number not in targets:
+                    self.futures.pop(episode_number).cancel()
+
+            for episode_number in targets:
+                if episode_number not in self.futures:
+                    self.futures[episode_number] = self.executor.submit(
+                        self.resolve_episode, url, anime_name, episode_number)
+
+    def take(self, url, episode_number):
+        """
+        Get the prefetched episode, waiting for it if it is still being resolved.
+
+        The episode may have been prefetched long ago, so its stream URL is only returned if the
+        stream cache still holds it (it is resolved again if it expired or was invalidated).
+
+        Args:
+            url (str): The URL of the anime.
+            episode_number (int): The episode number.
+
+        Returns:
+            tuple: The episode URL and the stream URL, or None if the episode was not prefetched (or failed).
+        """
+        with self.lock:
+            if url != self.anime_url:
+                return None
+            future = self.futures.pop(episode_number, None)
+        if future is None or future.cancelled():
+            return None
+        try:
+            episode_url, stream_url = future.result()
+        except Exception as e:
+            logger.error(f"Error while prefetching episode {episode_number}: {e}")
+            return None
+        if self.url_interactions.stream_cache is None:
+            return episode_url, stream_url
+        try:
+            # Served from the cache while the stream is fresh, resolved again otherwise
+            return episode_url, self.url_interactions.get_streaming_url(episode_url)
+        except Exception as e:
+            logger.error(f"Error while refreshing the prefetched stream of episode {episode_number}: {e}")
+            return None
+
+    def cancel_futures(self):
+        """ Cancel the prefetches (the ones already running finish in the background and are ignored). """
+        for future in self.futures.values():
+            future.cancel()
+        self.futures = {}
+
+    def cancel(self):
+        """ Cancel the prefetches of the current anime (e.g. when the user changes anime). """
+        with self.lock:
+            self.cancel_futures()
+            self.anime_url = None
+
+    def shutdown(self):
+        """ Stop the prefetcher. """
+        self.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
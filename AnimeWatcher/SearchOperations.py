@@ -0,0 +1,273 @@
+from Config.config import WebOperationsConfig, AnimeWatcherConfig, WebElementsConfig, SessionConfig
+from Config.logs_config import setup_logging
+from AnimeWatcher.SessionOperations import create_session
+from bs4 import BeautifulSoup
+from urllib.parse import urljoin
+import requests
+import re
+
+# Logging configuration
+logger = setup_logging(AnimeWatcherConfig.ANIME_WATCH_LOG_FILENAME,
+                       AnimeWatcherConfig.ANIME_WATCH_LOG_PATH)
+
+
+class SearchInteractions:
+    def __init__(self, session=None):
+        """
+        Initializes the SearchInteractions class (HTTP-only scraping of the search pages).
+
+        Args:
+            session (requests.Session, optional): The pooled session to use. A new one is created if not provided.
+        """
+        self.session = session if session else create_session()
+
+    def format_search_url(self, input_anime_name, page_number=1):
+        """
+        Formats the search URL for the given anime name and page number.
+
+        Args:
+            input_anime_name (str): The anime name (already formatted for the URL).
+            page_number (int, optional): The page number. Defaults to 1.
+
+        Returns:
+            str: The formatted search URL.
+        """
+        return WebOperationsConfig.GOGO_ANIME_SEARCH.format(input_anime_name) + f"&page={page_number}"
+
+    def is_challenge_page(self, response):
+        """
+        Checks if the response is an anti-bot challenge page instead of the search results.
+
+        Args:
+            response (requests.Response): The response to check.
+
+        Returns:
+            bool: True if the response is a challenge page, False otherwise.
+        """
+        if response.status_code in WebOperationsConfig.CHALLENGE_STATUS_CODES:
+            return True
+        return any(marker in response.text for marker in WebOperationsConfig.CHALLENGE_MARKERS)
+
+    def get_soup_object(self, url):
+        """
+        Retrieves the HTML soup of the given URL.
+
+        Args:
+            url (str): The URL to retrieve.
+
+        Returns:
+            BeautifulSoup: The HTML soup, or None if a challenge page was served.
+
+        Raises:
+            requests.RequestException: If the request fails.
+        """
+        response = self.session.get(url, timeout=SessionConfig.REQUEST_TIMEOUT)
+        if self.is_challenge_page(response):
+            logger.warning(f"Challenge page detected while requesting {url}")
+            return None
+        # Raise an exception for any other HTTP error
+        response.raise_for_status()
+        return BeautifulSoup(response.content, "html.parser")
+
+    def get_page_if_modified(self, url, etag=None, last_modified=None):
+        """
+        Retrieves a page with a conditional request (the server answers 304 if the page didn't change).
+
+        Args:
+            url (str): The URL to retrieve.
+            etag (str, optional): The ETag of the last version of the page. Defaults to None.
+            last_modified (str, optional): The Last-Modified date of the last version of the page. Defaults to None.
+
+        Returns:
+            requests.Response: The response (status 304 if the page didn't change), or None if a challenge page was served.
+
+        Raises:
+            requests.RequestException: If the request fails.
+        """
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        response = self.session.get(url, headers=headers, timeout=SessionConfig.REQUEST_TIMEOUT)
+        if response.status_code == 304:
+            return response
+        if self.is_challenge_page(response):
+            logger.warning(f"Challenge page detected while requesting {url}")
+            return None
+        response.raise_for_status()
+        return response
+
+    def parse_anime_list(self, soup, base_url):
+        """
+        Parses the anime titles and links from the search results.
+
+        Args:
+            soup (BeautifulSoup): The HTML soup of the search page.
+            base_url (str): The URL of the page (used to resolve relative links).
+
+        Returns:
+            list: A list of dictionaries containing the title and link of each anime.
+        """
+        ul_items = soup.select_one(WebOperationsConfig.UL_ITEMS)
+        if ul_items is None:
+            return []
+
+        anime_list = []
+        for li in ul_items.find_all(WebElementsConfig.LI_ELEMENT):
+            hyperlink = li.find(WebElementsConfig.HYPERLINK, href=True)
+            if hyperlink is None:
+                continue
+            # Prefer the name paragraph, fall back to the first text of the li (same as the Selenium path)
+            name = li.select_one(WebOperationsConfig.ANIME_NAME)
+            title = name.get_text(strip=True) if name else next(li.stripped_strings, "")
+            anime_list.append({
+                'title': title,
+                'link': urljoin(base_url, hyperlink[WebElementsConfig.HREF])
+            })
+        return anime_list
+
+    def parse_pagination(self, soup):
+        """
+        Parses the page numbers from the pagination div.
+
+        Args:
+            soup (BeautifulSoup): The HTML soup of the search page.
+
+        Returns:
+            list: A list of page numbers, [1] if there is no pagination.
+        """
+        pagination_div = soup.select_one(WebOperationsConfig.ANIME_NAME_PAGINATION)
+        if pagination_div is None:
+            return [1]
+        page_numbers = [int(link[WebOperationsConfig.DATA_PAGE])
+                        for link in pagination_div.select(WebOperationsConfig.UL_PAGINATION_LIST)
+                        if link.get(WebOperationsConfig.DATA_PAGE, "").isdigit()]
+        # Keep the page order and drop duplicates (e.g. "next" links pointing to an existing page)
+        return sorted(set(page_numbers)) if page_numbers else [1]
+
+    def parse_anime_listing(self, soup, base_url):
+        """
+        Parses the anime titles and links from a page of the full anime list.
+
+        Args:
+            soup (BeautifulSoup): The HTML soup of the anime list page.
+            base_url (str): The URL of the page (used to resolve relative links).
+
+        Returns:
+            list: A list of dictionaries containing the title and link of each anime.
+        """
+        listing = soup.select_one(f"div.{WebOperationsConfig.ANIME_LIST_BODY} ul.{WebOperationsConfig.ANIME_LISTING}")
+        if listing is None:
+            return []
+        return [{'title': hyperlink.get_text(strip=True), 'link': urljoin(base_url, hyperlink[WebElementsConfig.HREF])}
+                for hyperlink in listing.select(f"{WebElementsConfig.LI_ELEMENT} {WebElementsConfig.HYPERLINK}[href]")]
+
+    def parse_episode_range(self, soup):
+        """
+        Parses the episode range from the episode pages list of an anime page.
+
+        Args:
+            soup (BeautifulSoup): The HTML soup of the anime page.
+
+        Returns:
+            tuple: The first and last episode numbers, or None if the list is not on the page.
+        """
+        episode_page = soup.find(id=WebOperationsConfig.EPISODE_PAGE)
+        if episode_page is None:
+            return None
+        max_end = 1
+        for hyperlink in episode_page.find_all(WebElementsConfig.HYPERLINK):
+            ep_end = hyperlink.get(WebOperationsConfig.EP_END, "")
+            if ep_end.isdigit():
+                max_end = max(max_end, int(ep_end))
+        return 1, max_end
+
+    def parse_other_names(self, soup):
+        """
+        Parses the alternate names of an anime from its information paragraphs.
+
+        Args:
+            soup (BeautifulSoup): The HTML soup of the anime page.
+
+        Returns:
+            list: The alternate names (empty if there are none).
+        """
+        for paragraph in soup.select(WebOperationsConfig.ANIME_INFO_TYPE):
+            label = paragraph.find("span")
+            if label is None or not label.get_text(strip=True).startswith(WebOperationsConfig.OTHER_NAME_LABEL):
+                continue
+            label.extract()
+            # The names are separated by commas or semicolons
+            names = re.split(r'[,;]', paragraph.get_text(" ", strip=True))
+            return [name.strip() for name in names if name.strip()]
+        return []
+
+    def parse_anime_details(self, soup, base_url=None):
+        """
+        Parses the details of an anime used by the catalog.
+
+        Args:
+            soup (BeautifulSoup): The HTML soup of the anime page.
+            base_url (str, optional): The URL of the page (unused, for fetch_page).
+
+        Returns:
+            dict: The last episode number ('episodes', None if not found) and the alternate names ('other_names').
+        """
+        episode_range = self.parse_episode_range(soup)
+        return {
+            'episodes': episode_range[1] if episode_range else None,
+            'other_names': self.parse_other_names(soup)
+        }
+
+    def fetch_page(self, url, parser):
+        """
+        Fetches a page and parses it.
+
+        Args:
+            url (str): The URL of the page.
+            parser (callable): Called with the HTML soup and the URL of the page.
+
+        Returns:
+            The result of the parser, or None if the page could not be fetched over HTTP.
+        """
+        try:
+            soup = self.get_soup_object(url)
+            return parser(soup, url) if soup is not None else None
+        except requests.RequestException as e:
+            logger.error(f"Error while fetching {url}: {e}")
+            return None
+
+    def fetch_episode_range(self, url):
+        """
+        Fetches the episode range of an anime with a single request.
+
+        Args:
+            url (str): The URL of the anime page.
+
+        Returns:
+            tuple: The first and last episode numbers, or None if they could not be fetched over HTTP.
+        """
+        return self.fetch_page(url, lambda soup, _: self.parse_episode_range(soup))
+
+    def fetch_search_page(self, input_anime_name, page_number=1):
+        """
+        Fetches and parses a single page of the search results.
+
+        Args:
+            input_anime_name (str): The anime name (already formatted for the URL).
+            page_number (int, optional): The page number. Defaults to 1.
+
+        Returns:
+            tuple: The list of animes on the page and the list of page numbers,
+                or None if the page could not be parsed over HTTP (challenge page or request error).
+        """
+        url = self.format_search_url(input_anime_name, page_number)
+        try:
+            soup = self.get_soup_object(url)
+            if soup is None:
+                return None
+            return self.parse_anime_list(soup, url), self.parse_pagination(soup)
+        except requests.RequestException as e:
+            logger.error(f"Error while fetching search page {page_number} for '{input_anime_name}': {e}")
+            return None
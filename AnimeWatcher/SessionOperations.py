@@ -0,0 +1,30 @@
+import random
+import requests
+from requests.adapters import HTTPAdapter, Retry
+from Config.config import SessionConfig, DriverConfig
+
+
+def create_session(pool_maxsize=SessionConfig.POOL_MAXSIZE):
+    """
+    Creates a pooled HTTP session that keeps connections alive between requests.
+
+    Args:
+        pool_maxsize (int, optional): The maximum number of connections kept per host. Defaults to SessionConfig.POOL_MAXSIZE.
+
+    Returns:
+        requests.Session: The configured session.
+    """
+    # Create a new session
+    session = requests.Session()
+    # Retry failed connections with an exponential backoff
+    retry = Retry(connect=SessionConfig.RETRY_CONNECT,
+                  backoff_factor=SessionConfig.RETRY_BACKOFF_FACTOR)
+    # Create a pooled HTTP adapter
+    adapter = HTTPAdapter(pool_connections=SessionConfig.POOL_CONNECTIONS,
+                          pool_maxsize=pool_maxsize, max_retries=retry)
+    # Mount the adapter for both HTTP and HTTPS
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    # Pretend to be a real browser (same user agents as the Selenium driver)
+    session.headers.update({"User-Agent": random.choice(DriverConfig.USER_AGENTS)})
+    return session
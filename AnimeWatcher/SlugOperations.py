@@ -0,0 +1,92 @@
+from Config.logs_config import setup_logging
+from Config.config import EpisodeTrackerConfig
+import threading
+import json
+import os
+
+# Setup logging
+logger = setup_logging(EpisodeTrackerConfig.EPISODE_TRACKER_LOG_FILENAME, EpisodeTrackerConfig.EPISODE_TRACKER_LOG_PATH)
+
+
+class SlugCache:
+    def __init__(self):
+        """
+        Initializes the cache of the episode slugs (the anime part of the episode links) learned per anime.
+
+        The file maps the anime URL to the slug that worked and the slugs known to be wrong:
+        {anime_url: {'slug': 'anime-name', 'bad_slugs': ['other-name']}}
+        """
+        self.lock = threading.Lock()
+        self.slugs = self.read_json_file()
+
+    def read_json_file(self):
+        """
+        Read the learned slugs from the JSON file.
+
+        Returns:
+            dict: The learned slugs, empty if the file doesn't exist or is invalid.
+        """
+        try:
+            with open(EpisodeTrackerConfig.SLUG_CACHE_FILE, 'r') as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.error(f"Error reading slug cache, starting with an empty cache: {e}")
+            return {}
+
+    def save_json_file(self):
+        """ Save the learned slugs (written to a temporary file first so a crash can't corrupt it). """
+        try:
+            directory = os.path.dirname(EpisodeTrackerConfig.SLUG_CACHE_FILE)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            temp_file = f"{EpisodeTrackerConfig.SLUG_CACHE_FILE}.tmp"
+            with open(temp_file, 'w') as file:
+                json.dump(self.slugs, file)
+            os.replace(temp_file, EpisodeTrackerConfig.SLUG_CACHE_FILE)
+        except Exception as e:
+            logger.error(f"Error saving slug cache: {e}")
+
+    def get_slug(self, anime_url):
+        """
+        Get the slug that worked for the anime.
+
+        Returns:
+            str: The slug, or None if it is not known yet.
+        """
+        with self.lock:
+            return self.slugs.get(anime_url, {}).get('slug')
+
+    def is_bad(self, anime_url, slug):
+        """
+        Check if the slug is known not to work for the anime.
+        """
+        with self.lock:
+            return slug in self.slugs.get(anime_url, {}).get('bad_slugs', [])
+
+    def remember(self, anime_url, slug, bad_slugs=()):
+        """
+        Remember the slug that worked for the anime, and the ones that didn't.
+
+        Args:
+            anime_url (str): The URL of the anime.
+            slug (str): The slug that worked.
+            bad_slugs (iterable, optional): The slugs that were tried before and didn't work.
+        """
+        with self.lock:
+            entry = self.slugs.setdefault(anime_url, {'slug': None, 'bad_slugs': []})
+            entry['slug'] = slug
+            entry['bad_slugs'] = sorted(set(entry['bad_slugs']).union(bad_slugs) - {slug})
+            self.save_json_file()
+
+    def forget(self, anime_url):
+        """
+        Forget what was learned for the anime, the slug that worked and the known-bad slugs.
+
+        A slug that failed once may work later (e.g. the failure was a timeout), so all the
+        candidates are probed again.
+        """
+        with self.lock:
+            if self.slugs.pop(anime_url, None) is not None:
+                self.save_json_file()
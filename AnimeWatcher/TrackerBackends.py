@@ -0,0 +1,419 @@
+from Config.logs_config import setup_logging
+from Config.config import EpisodeTrackerConfig, DatabaseConfig
+from AnimeWatcher.EpisodeRanges import EpisodeRanges
+from AnimeWatcher.FileOperations import write_file_atomically
+import threading
+import sqlite3
+import atexit
+import time
+import json
+import os
+
+# Setup logging
+logger = setup_logging(EpisodeTrackerConfig.EPISODE_TRACKER_LOG_FILENAME, EpisodeTrackerConfig.EPISODE_TRACKER_LOG_PATH)
+database_logger = setup_logging(DatabaseConfig.DATABASE_LOG_FILENAME, DatabaseConfig.DATABASE_LOG_PATH)
+
+
+def parse_watched_episodes(watched_episodes):
+    """
+    Parse the watched episodes of a tracker JSON file, either in the compact range form ("1-1050,1052")
+    or as a list of episode numbers (older files).
+
+    Returns:
+        EpisodeRanges: The watched episodes.
+    """
+    if isinstance(watched_episodes, str):
+        return EpisodeRanges.from_string(watched_episodes)
+    return EpisodeRanges.from_episodes(watched_episodes)
+
+def read_tracker_json(json_file):
+    """
+    Read the watched episodes from a tracker JSON file.
+
+    Args:
+        json_file (str): The path of the JSON file.
+
+    Returns:
+        dict: The watched episodes of each anime ({title: EpisodeRanges}).
+    """
+    with open(json_file, 'r') as file:
+        return {anime['title']: parse_watched_episodes(anime['watched_episodes']) for anime in json.load(file)}
+
+
+class DebouncedWriter:
+    def __init__(self, flush, delay=EpisodeTrackerConfig.SAVE_DELAY, max_delay=EpisodeTrackerConfig.SAVE_MAX_DELAY):
+        """
+        Initializes a background writer that coalesces the changes and flushes them once
+        no change happened for `delay` seconds (or after `max_delay` seconds at most).
+
+        Args:
+            flush (callable): Writes the pending changes.
+            delay (float, optional): Seconds without changes before flushing. Defaults to EpisodeTrackerConfig.SAVE_DELAY.
+            max_delay (float, optional): Maximum seconds a change can wait. Defaults to EpisodeTrackerConfig.SAVE_MAX_DELAY.
+        """
+        self.flush = flush
+        self.delay = delay
+        self.max_delay = max_delay
+        self.condition = threading.Condition()
+        self.pending = False
+        self.closed = False
+        self.first_change = None
+        self.last_change = None
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def schedule(self):
+        """ Record a change, it will be flushed after the debounce delay. """
+        with self.condition:
+            now = time.monotonic()
+            if not self.pending:
+                self.pending = True
+                self.first_change = now
+            self.last_change = now
+            self.condition.notify()
+
+    def get_flush_time(self):
+        """ Get the time of the next flush (called with the condition held). """
+        return min(self.last_change + self.delay, self.first_change + self.max_delay)
+
+    def run(self):
+        """ Flush the pending changes in the background. """
+        while True:
+            with self.condition:
+                while not self.pending and not self.closed:
+                    self.condition.wait()
+                if self.closed:
+                    return
+                # Wait until the changes settled (new changes push the flush back)
+                while self.pending and not self.closed and time.monotonic() < self.get_flush_time():
+                    self.condition.wait(self.get_flush_time() - time.monotonic())
+                if self.closed:
+                    return
+                self.pending = False
+            self.flush_changes()
+
+    def flush_changes(self):
+        """ Write the pending changes, logging the errors (the writer must keep running). """
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Error while flushing the episode tracker: {e}")
+
+    def close(self):
+        """ Stop the writer and flush the pending changes. """
+        with self.condition:
+            if self.closed:
+                return
+            self.closed = True
+            pending = self.pending
+            self.pending = False
+            self.condition.notify()
+        self.thread.join()
+        if pending:
+            self.flush_changes()
+
+
+class JsonTrackerBackend:
+    def __init__(self, json_file=EpisodeTrackerConfig.ANIME_WATCHER_JSON_FILE):
+        """
+        Initializes the JSON storage of the episode tracker. The whole history is kept in memory,
+        the changes are written by a background writer after a short delay and on shutdown.
+
+        Args:
+            json_file (str, optional): The path of the JSON file. Defaults to EpisodeTrackerConfig.ANIME_WATCHER_JSON_FILE.
+        """
+        self.json_file = json_file
+        self.lock = threading.Lock()
+        self.episode_dict = {}
+        self.read_json_file()
+        self.writer = DebouncedWriter(self.save_json_file)
+        # Flush the pending changes even if close() is never called
+        atexit.register(self.close)
+
+    def read_json_file(self):
+        """
+        Read data from the JSON file and populate self.episode_dict.
+        """
+        try:
+            if not os.path.exists(self.json_file):
+                logger.warning("JSON file not found. Creating a new file.")
+                self.create_empty_file()
+
+            # Watched episodes are kept as ranges for compact storage and fast lookup
+            self.episode_dict = read_tracker_json(self.json_file)
+
+        except json.JSONDecodeError:
+            # Keep the corrupted file so the history can be recovered by hand
+            backup_file = f"{self.json_file}.corrupt-{int(time.time())}"
+            logger.error(f"Error decoding JSON file. Moved it to {backup_file} and reinitializing as an empty list.")
+            os.replace(self.json_file, backup_file)
+            self.episode_dict = {}
+            self.create_empty_file()
+
+        except Exception as e:
+            logger.error(f"Error reading JSON file: {e}")
+            self.episode_dict = {}
+            raise e
+
+    def create_empty_file(self):
+        """ Create an empty JSON file. """
+        try:
+            directory = os.path.dirname(self.json_file)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+
+            with open(self.json_file, 'w') as file:
+                json.dump([], file)
+            logger.info("Created a new empty JSON file.")
+
+        except Exception as e:
+            logger.error(f"Error creating empty JSON file: {e}")
+            raise
+
+    def save_json_file(self):
+        """ Save the updated JSON file (called by the background writer). """
+        try:
+            # Take a snapshot of the history, the file is written without holding the lock
+            with self.lock:
+                episode_list = [{'title': title, 'watched_episodes': episodes.to_string()}
+                                for title, episodes in self.episode_dict.items()]
+            write_file_atomically(self.json_file, json.dumps(episode_list, indent=4))
+        except Exception as e:
+            logger.error(f"Error saving JSON file: {e}")
+            raise e
+
+    def get_watched_episodes(self, anime_name):
+        """
+        Get the watched episodes of an anime.
+
+        Returns:
+            EpisodeRanges: The watched episodes, or None if the anime is not tracked.
+        """
+        with self.lock:
+            episodes = self.episode_dict.get(anime_name)
+            return EpisodeRanges(episodes.ranges()) if episodes is not None else None
+
+    def add_anime(self, anime_name):
+        """ Add a new anime with no watched episodes. """
+        with self.lock:
+            if anime_name not in self.episode_dict:
+                self.episode_dict[anime_name] = EpisodeRanges()
+                self.writer.schedule()
+
+    def add_episode(self, anime_name, episode_number):
+        """ Mark an episode as watched (the anime is added if needed). """
+        with self.lock:
+            if self.episode_dict.setdefault(anime_name, EpisodeRanges()).add(episode_number):
+                self.writer.schedule()
+
+    def close(self):
+        """ Flush the pending changes and stop the background writer. """
+        self.writer.close()
+
+
+class SqliteTrackerBackend:
+    def __init__(self, db_file=EpisodeTrackerConfig.SQLITE_FILE, json_file=EpisodeTrackerConfig.ANIME_WATCHER_JSON_FILE):
+        """
+        Initializes the SQLite storage of the episode tracker. Every watched episode is a single-row upsert,
+        and WAL mode lets several running instances share the database.
+
+        Args:
+            db_file (str, optional): The path of the database. Defaults to EpisodeTrackerConfig.SQLITE_FILE.
+            json_file (str, optional): The JSON file migrated into the database the first time. Defaults to EpisodeTrackerConfig.ANIME_WATCHER_JSON_FILE.
+        """
+        self.db_file = db_file
+        self.lock = threading.Lock()
+        directory = os.path.dirname(db_file)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        # The connection is shared with the background threads (binge mode), access is serialized by self.lock
+        self.connection = sqlite3.connect(db_file, timeout=EpisodeTrackerConfig.SQLITE_TIMEOUT, check_same_thread=False)
+        self.create_tables()
+        self.migrate_json_file(json_file)
+
+    def create_tables(self):
+        """ Create the tables if they don't exist. """
+        with self.lock, self.connection:
+            # Readers don't block the writer (and the other way around)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.execute("CREATE TABLE IF NOT EXISTS anime (title TEXT PRIMARY KEY)")
+            # The primary key indexes the episodes by title
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS watched_episodes ("
+                "title TEXT NOT NULL, episode INTEGER NOT NULL, watched_at REAL NOT NULL, "
+                "PRIMARY KEY (title, episode)) WITHOUT ROWID")
+            self.connection.execute("CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value TEXT)")
+
+    def migrate_json_file(self, json_file):
+        """
+        Import the JSON tracker file into the database (only done once).
+
+        Args:
+            json_file (str): The path of the JSON file.
+        """
+        with self.lock:
+            if self.connection.execute("SELECT 1 FROM metadata WHERE key = 'json_migrated'").fetchone():
+                return
+            try:
+                episode_dict = read_tracker_json(json_file) if os.path.exists(json_file) else {}
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                # Don't mark the file as migrated, so its history isn't lost and the next start tries again
+                logger.error(f"Error reading JSON file for the migration, retrying on the next start: {e}")
+                return
+
+            now = time.time()
+            with self.connection:
+                # Take the write lock before checking again, another instance may have migrated the file meanwhile
+                self.connection.execute("BEGIN IMMEDIATE")
+                if self.connection.execute("SELECT 1 FROM metadata WHERE key = 'json_migrated'").fetchone():
+                    return
+                self.connection.executemany("INSERT OR IGNORE INTO anime (title) VALUES (?)",
+                                            [(title,) for title in episode_dict])
+                self.connection.executemany(
+                    "INSERT OR IGNORE INTO watched_episodes (title, episode, watched_at) VALUES (?, ?, ?)",
+                    [(title, episode, now) for title, episodes in episode_dict.items() for episode in episodes])
+                self.connection.execute("INSERT OR IGNORE INTO metadata (key, value) VALUES ('json_migrated', ?)", (str(now),))
+            if episode_dict:
+                logger.info(f"Migrated {len(episode_dict)} anime from {json_file} to {self.db_file}")
+
+    def get_watched_episodes(self, anime_name):
+        """
+        Get the watched episodes of an anime.
+
+        Returns:
+            EpisodeRanges: The watched episodes, or None if the anime is not tracked.
+        """
+        with self.lock:
+            if self.connection.execute("SELECT 1 FROM anime WHERE title = ?", (anime_name,)).fetchone() is None:
+                return None
+            # Consecutive episodes share the same (episode - row number), so grouping on it gives the ranges
+            rows = self.connection.execute(
+                "SELECT MIN(episode), MAX(episode) FROM ("
+                "SELECT episode, episode - ROW_NUMBER() OVER (ORDER BY episode) AS range_id "
+                "FROM watched_episodes WHERE title = ?) GROUP BY range_id ORDER BY 1", (anime_name,))
+            return EpisodeRanges(rows.fetchall())
+
+    def add_anime(self, anime_name):
+        """ Add a new anime with no watched episodes. """
+        with self.lock, self.connection:
+            self.connection.execute("INSERT OR IGNORE INTO anime (title) VALUES (?)", (anime_name,))
+
+    def add_episode(self, anime_name, episode_number):
+        """ Mark an episode as watched (the anime is added if needed). """
+        with self.lock, self.connection:
+            self.connection.execute("INSERT OR IGNORE INTO anime (title) VALUES (?)", (anime_name,))
+            self.connection.execute(
+                "INSERT INTO watched_episodes (title, episode, watched_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (title, episode) DO UPDATE SET watched_at = excluded.watched_at",
+                (anime_name, episode_number, time.time()))
+
+    def close(self):
+        """ Close the database connection. """
+        with self.lock:
+            self.connection.close()
+
+
+class MongoTrackerBackend:
+    def __init__(self, connection_string=DatabaseConfig.CONNECTION_STRING, json_file=EpisodeTrackerConfig.ANIME_WATCHER_JSON_FILE):
+        """
+        Initializes the MongoDB storage of the episode tracker, so several machines can share the watch history.
+        Each anime is a document ({'title': ..., 'watched_episodes': [...]}) updated with $addToSet.
+
+        Args:
+            connection_string (str, optional): The MongoDB connection string. Defaults to DatabaseConfig.CONNECTION_STRING.
+            json_file (str, optional): The JSON file imported into the database the first time. Defaults to EpisodeTrackerConfig.ANIME_WATCHER_JSON_FILE.
+
+        Raises:
+            ValueError: If no connection string is configured.
+        """
+        if not connection_string:
+            raise ValueError("MONGODB_CONNECTION_STRING is not set")
+        # pymongo is only needed by this backend
+        from pymongo import MongoClient
+        # The client keeps a pool of connections shared by all the threads
+        self.client = MongoClient(connection_string, maxPoolSize=DatabaseConfig.MAX_POOL_SIZE,
+                                  serverSelectionTimeoutMS=DatabaseConfig.SERVER_SELECTION_TIMEOUT_MS)
+        database = self.client[DatabaseConfig.DATABASE_NAME]
+        self.collection = database[DatabaseConfig.WATCHED_EPISODES_COLLECTION]
+        self.metadata = database[DatabaseConfig.METADATA_COLLECTION]
+        self.collection.create_index("title", unique=True)
+        self.migrate_json_file(json_file)
+
+    def migrate_json_file(self, json_file):
+        """
+        Import the JSON tracker file into the database (only done once per database).
+
+        Args:
+            json_file (str): The path of the JSON file.
+        """
+        if self.metadata.find_one({'_id': 'json_migrated'}):
+            return
+        try:
+            episode_dict = read_tracker_json(json_file) if os.path.exists(json_file) else {}
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            # Don't mark the file as migrated, so its history isn't lost and the next start tries again
+            database_logger.error(f"Error reading JSON file for the migration, retrying on the next start: {e}")
+            return
+        self.import_history(episode_dict)
+        self.metadata.update_one({'_id': 'json_migrated'}, {'$set': {'at': time.time()}}, upsert=True)
+
+    def import_history(self, episode_dict):
+        """
+        Import a watch history with a single bulk write (merged with the existing history).
+
+        Args:
+            episode_dict (dict): The watched episodes of each anime ({title: iterable of episode numbers}).
+        """
+        from pymongo import UpdateOne
+        operations = [UpdateOne({'title': title},
+                                {'$addToSet': {'watched_episodes': {'$each': list(episodes)}}},
+                                upsert=True)
+                      for title, episodes in episode_dict.items()]
+        if operations:
+            result = self.collection.bulk_write(operations, ordered=False)
+            database_logger.info(f"Imported {len(operations)} anime ({result.upserted_count} new)")
+
+    def get_watched_episodes(self, anime_name):
+        """
+        Get the watched episodes of an anime.
+
+        Returns:
+            EpisodeRanges: The watched episodes, or None if the anime is not tracked.
+        """
+        document = self.collection.find_one({'title': anime_name}, {'_id': 0, 'watched_episodes': 1})
+        if document is None:
+            return None
+        return EpisodeRanges.from_episodes(document.get('watched_episodes', []))
+
+    def add_anime(self, anime_name):
+        """ Add a new anime with no watched episodes. """
+        self.collection.update_one({'title': anime_name},
+                                   {'$setOnInsert': {'watched_episodes': []}}, upsert=True)
+
+    def add_episode(self, anime_name, episode_number):
+        """ Mark an episode as watched (the anime is added if needed). """
+        self.collection.update_one({'title': anime_name},
+                                   {'$addToSet': {'watched_episodes': episode_number}}, upsert=True)
+
+    def close(self):
+        """ Close the connections of the client. """
+        self.client.close()
+
+
+def create_backend():
+    """
+    Create the storage backend selected by EpisodeTrackerConfig.STORAGE_BACKEND.
+
+    Returns:
+        The storage backend of the episode tracker.
+    """
+    match EpisodeTrackerConfig.STORAGE_BACKEND:
+        case "json":
+            return JsonTrackerBackend()
+        case "sqlite":
+            return SqliteTrackerBackend()
+        case "mongodb":
+            return MongoTrackerBackend()
+        case backend:
+            raise ValueError(f"Unknown episode tracker backend: {backend}")
@@ -1,69 +1,26 @@
 from Config.logs_config import setup_logging
 from Config.config import EpisodeTrackerConfig
-import os
-import json
+from AnimeWatcher.TrackerBackends import create_backend
 
 # Setup logging
 logger = setup_logging(EpisodeTrackerConfig.EPISODE_TRACKER_LOG_FILENAME,EpisodeTrackerConfig.EPISODE_TRACKER_LOG_PATH)
 
 class EpisodeTracker():
-    def __init__(self):
-        self.episode_list = []
-        self.episode_dict = {}
-        self.read_json_file()
-
-    def read_json_file(self):
-        """
-        Read data from the JSON file and populate self.episode_list.
+    def __init__(self, backend=None):
         """
-        try:
-            if not os.path.exists(EpisodeTrackerConfig.ANIME_WATCHER_JSON_FILE):
-                logger.warning("JSON file not found. Creating a new file.")
-                self.create_empty_file()
-
-            with open(EpisodeTrackerConfig.ANIME_WATCHER_JSON_FILE, 'r') as file:
-                self.episode_list = json.load(file)
+        Initializes the episode tracker.
 
-            # Convert watched episodes to sets for faster lookup
-            for anime in self.episode_list:
-                anime['watched_episodes'] = set(anime['watched_episodes'])
-                self.episode_dict[anime['title']] = anime['watched_episodes']  # Store in dictionary
-
-        except json.JSONDecodeError:
-            logger.error("Error decoding JSON file. Reinitializing as an empty list.")
-            self.episode_list = []
-            self.create_empty_file()
-
-        except Exception as e:
-            logger.error(f"Error reading JSON file: {e}")
-            self.episode_list = []
-            raise e
-
-    def create_empty_file(self):
-        """ Create an empty JSON file. """
-        try:
-            directory = os.path.dirname(EpisodeTrackerConfig.ANIME_WATCHER_JSON_FILE)
-            if directory and not os.path.exists(directory):
-                os.makedirs(directory)
-
-            with open(EpisodeTrackerConfig.ANIME_WATCHER_JSON_FILE, 'w') as file:
-                json.dump([], file)
-            logger.info("Created a new empty JSON file.")
-
-        except Exception as e:
-            logger.error(f"Error creating empty JSON file: {e}")
-            raise
+        Args:
+            backend (optional): The storage backend. Defaults to the one selected by EpisodeTrackerConfig.STORAGE_BACKEND.
+        """
+        self.backend = backend if backend else create_backend()
 
     def add_anime(self, anime_name):
         """
         Add a new anime with no watched episodes initially.
         """
         try:
-            self.episode_list.append({
-                'title': anime_name,
-                'watched_episodes': []  # Empty list for watched episodes
-            })
-            self.save_json_file()
+            self.backend.add_anime(anime_name)
 
         except Exception as e:
             logger.error(f"Error adding anime '{anime_name}': {e}")
@@ -74,43 +31,36 @@ class EpisodeTracker():
         Update the watched status for a specific episode.
         """
         try:
-            for anime in self.episode_list:
-                if anime['title'] == anime_name:
-                    if episode_number not in anime['watched_episodes']:
-                        anime['watched_episodes'].append(episode_number)
-                        self.save_json_file()
-                        return
-
-            logger.warning(f"Anime '{anime_name}' or episode {episode_number} not found.")
+            self.backend.add_episode(anime_name, episode_number)
 
         except Exception as e:
             logger.error(f"Error updating anime '{anime_name}', episode {episode_number}: {e}")
             raise
 
-    def save_json_file(self):
-        """ Save the updated JSON file. """
-        try:
-            with open(EpisodeTrackerConfig.ANIME_WATCHER_JSON_FILE, 'w') as file:
-                json.dump(self.episode_list, file, indent=4)
-        except Exception as e:
-            logger.error(f"Error saving JSON file: {e}")
-            raise e
-
-    def get_watched_list(self, anime_name, start_episode, end_episode):
+    def get_watched_episodes(self, anime_name):
         """
-        Get the list of unwatched episodes within the specified range.
+        Get the watched episodes of an anime.
+
+        Returns:
+            EpisodeRanges: The watched episodes, or None if the anime is not tracked.
         """
-        # Directly access the anime's watched episodes from the dictionary for fast lookup
-        watched_episodes = self.episode_dict.get(anime_name)
+        return self.backend.get_watched_episodes(anime_name)
 
-        if watched_episodes is None:
-            # If anime is not found, add it and return an empty list
-            self.add_anime(anime_name)
-            return []
+    def next_unwatched(self, anime_name, after_episode=0):
+        """
+        Get the first unwatched episode after the given one.
 
-        # Create the set of all episodes in the given range
-        total_episodes = set(range(start_episode, end_episode + 1))
+        Returns:
+            int: The next unwatched episode number.
+        """
+        watched_episodes = self.get_watched_episodes(anime_name)
+        return watched_episodes.next_unwatched(after_episode) if watched_episodes else after_episode + 1
 
-        # Return the difference (unwatched episodes)
-        unwatched_episodes = list(total_episodes - watched_episodes)
-        return unwatched_episodes
+    def close(self):
+        """
+        Close the storage backend.
+        """
+        try:
+            self.backend.close()
+        except Exception as e:
+            logger.error(f"Error closing the episode tracker: {e}")
@@ -1,10 +1,12 @@
 from Config.logs_config import setup_logging
-from Config.config import AnimeWatcherConfig
+from Config.config import AnimeWatcherConfig, SessionConfig
+from AnimeWatcher.SessionOperations import create_session
 from bs4 import BeautifulSoup
 import requests
-from requests.adapters import HTTPAdapter, Retry
 from Cryptodome.Cipher import AES
 from urllib.parse import urlparse, parse_qsl, urlencode
+from dataclasses import dataclass, field
+import time
 import re
 import base64
 import json
@@ -14,34 +16,55 @@ logger = setup_logging(AnimeWatcherConfig.ANIME_WATCH_LOG_FILENAME,
                        AnimeWatcherConfig.ANIME_WATCH_LOG_PATH)
 
 
+@dataclass
+class EmbedPage:
+    """Everything the resolver needs from the embedded video player page (fetched once)."""
+    url: str
+    video_id: str
+    encryption_keys: dict
+    encrypted_data: str
+
+
+@dataclass
+class AjaxRequest:
+    """The request sent to the AJAX endpoint to get the video sources."""
+    url: str
+    params: dict
+    alias: str
+    headers: dict
+
+
+@dataclass
+class StreamResolution:
+    """The result of the stream resolution, with the time spent in each stage (in seconds)."""
+    url: str
+    sources: list
+    timings: dict = field(default_factory=dict)
+
+
 class UrlInteractions:
 
-    def __init__(self, quality=None):
+    def __init__(self, quality=None, stream_cache=None):
         """
         Initializes a new instance of the UrlOperations class.
 
         Args:
             quality (str): The quality of the video.
+            stream_cache (StreamCache, optional): The cache of the resolved stream URLs. Defaults to None (no cache).
 
         Returns:
             None
         """
-        # Create a new session
-        self.session = requests.Session()
-        # retry the request 3 times with a backoff factor of 0.5 (backoff factor = 0.5 means that the retry will sleep for 0.5 seconds before retrying)
-        retry = Retry(connect=3, backoff_factor=0.5)
-        # create a new HTTP adapter
-        adapter = HTTPAdapter(max_retries=retry)
-        # mount the HTTP adapter to the session
-        self.session.mount("http://", adapter)
-        # mount the HTTPS adapter to the session
-        self.session.mount("https://", adapter)
-        # the URL to the AJAX endpoint (used for decrypting the video URL)
+        # Create a new pooled session (retries the connection 3 times with a backoff factor of 0.5)
+        self.session = create_session()
+        # the path of the AJAX endpoint (used for decrypting the video URL)
         self.ajax_url = "/encrypt-ajax.php?"
         # the mode to use for AES encryption
         self.mode = AES.MODE_CBC
         # the padding function to use for AES encryption
         self.padding = lambda s: s + chr(len(s) % 16) * (16 - len(s) % 16)
+        # the cache of the resolved stream URLs
+        self.stream_cache = stream_cache
 
     def close_session(self):
         """Closes the session."""
@@ -95,7 +118,7 @@ class UrlInteractions:
         """
         try:
             # Send a GET request to the URL
-            request = self.session.get(url)
+            request = self.session.get(url, timeout=SessionConfig.REQUEST_TIMEOUT)
             # Check if the request was successful
             self.check_response_error(request, url)
             # Create a BeautifulSoup object from the response content
@@ -152,9 +175,22 @@ class UrlInteractions:
         Returns:
             str: The data for the given episode URL.
         """
+        return self.parse_data(self.get_soup_object(ep_url), ep_url)
+
+    def parse_data(self, soup, ep_url):
+        """
+        Extracts the encrypted data from the HTML soup of the embedded video player page.
+
+        Args:
+            soup (BeautifulSoup): The HTML soup of the page.
+            ep_url (str): The URL of the page (used in the error message).
+
+        Returns:
+            str: The encrypted data.
+        """
         try:
             # Find the script tag containing the data
-            crypto = self.get_soup_object(ep_url).find("script", {"data-name": "episode"})
+            crypto = soup.find("script", {"data-name": "episode"})
             # Check if the requested data exists
             self.locating_element_error(crypto, ep_url, "token")
             # Return the data
@@ -169,12 +205,24 @@ class UrlInteractions:
         Args:
             ep_url (str): The URL of the episode to retrieve the encryption key for.
 
+        Returns:
+            dict: A dictionary containing the encryption key, initialization vector, and second key.
+        """
+        return self.parse_encryption_keys(self.session.get(ep_url, timeout=SessionConfig.REQUEST_TIMEOUT).text)
+
+    def parse_encryption_keys(self, html):
+        """
+        Extracts the encryption keys from the HTML of the embedded video player page.
+
+        Args:
+            html (str): The HTML of the page.
+
         Returns:
             dict: A dictionary containing the encryption key, initialization vector, and second key.
         """
         try:
             # Find the encryption keys
-            keys = re.findall(r"(?:container|videocontent)-(\d+)", self.session.get(ep_url).text)
+            keys = re.findall(r"(?:container|videocontent)-(\d+)", html)
             # Check if there are any keys found
             if not keys or len(keys) != 3:
                 raise ValueError("No encryption keys were found.")
@@ -236,32 +284,31 @@ class UrlInteractions:
         """
         return urlparse(ep_url).scheme + "://" + urlparse(ep_url).netloc + self.ajax_url
 
-    def decrypt_url(self, ep_url, encryption_keys):
+    def decrypt_data(self, encrypted_data, encryption_keys):
         """
-        Decrypts the given episode URL using the provided encryption keys.
+        Decrypts the data of the embedded video player page using the provided encryption keys.
 
         Args:
-            ep_url (str): The URL of the episode to decrypt.
+            encrypted_data (str): The encrypted data of the page.
             encryption_keys (dict): A dictionary containing the encryption key and initialization vector.
 
         Returns:
-            str: The decrypted episode URL.
+            str: The decrypted data (a query string).
         """
-        return self.aes_decrypt(self.get_data(ep_url), encryption_keys["key"], encryption_keys["iv"]).decode()
+        return self.aes_decrypt(encrypted_data, encryption_keys["key"], encryption_keys["iv"]).decode()
 
-    def create_dict_data(self, ep_url, encryption_keys, encrypted_id):
+    def create_dict_data(self, decrypted_data, encrypted_id):
         """
-        Creates a dictionary of data for a given episode URL, encryption keys, and encrypted ID.
+        Creates a dictionary of data for the AJAX request from the decrypted data and encrypted ID.
 
         Args:
-            ep_url (str): The URL of the episode.
-            encryption_keys (list): A list of encryption keys.
+            decrypted_data (str): The decrypted data of the embedded video player page.
             encrypted_id (str): The encrypted ID of the episode.
 
         Returns:
             dict: A dictionary of data for the given episode.
         """    
-        return {**dict(parse_qsl(self.decrypt_url(ep_url, encryption_keys))), 'id': encrypted_id}
+        return {**dict(parse_qsl(decrypted_data)), 'id': encrypted_id}
 
 
     def encrypt_id(self, id, encryption_keys):
@@ -318,7 +365,7 @@ class UrlInteractions:
             The response from the server.
         """
         try:
-            return self.session.post(url + urlencode(data) + f"&alias={id}", headers=header)
+            return self.session.post(url + urlencode(data) + f"&alias={id}", headers=header, timeout=SessionConfig.REQUEST_TIMEOUT)
         except requests.RequestException as e:
             raise Exception(f"Error while sending POST request: {e}")
 
@@ -347,27 +394,130 @@ class UrlInteractions:
         """
         return [x for x in json_response["source"]]
 
-    def get_streaming_url(self, ep_url):
+    def fetch_embed_page(self, embedded_url):
         """
-        Given an episode URL, returns the URL of the video stream.
+        Fetches the embedded video player page once and extracts everything needed to resolve the stream.
+
+        Args:
+            embedded_url (str): The URL of the embedded video player.
+
+        Returns:
+            EmbedPage: The ID, encryption keys and encrypted data of the page.
+        """
+        request = self.session.get(embedded_url, timeout=SessionConfig.REQUEST_TIMEOUT)
+        self.check_response_error(request, embedded_url)
+        return EmbedPage(
+            url=embedded_url,
+            video_id=self.create_id(embedded_url),
+            encryption_keys=self.parse_encryption_keys(request.text),
+            encrypted_data=self.parse_data(BeautifulSoup(request.content, "html.parser"), embedded_url),
+        )
+
+    def build_ajax_request(self, embed_page):
+        """
+        Builds the AJAX request from the embedded video player page (no network access).
+
+        Args:
+            embed_page (EmbedPage): The embedded video player page.
+
+        Returns:
+            AjaxRequest: The request to send to the AJAX endpoint.
+        """
+        encryption_keys = embed_page.encryption_keys
+        encrypted_id = self.encrypt_id(embed_page.video_id, encryption_keys)
+        return AjaxRequest(
+            url=self.create_ajax_url(embed_page.url),
+            params=self.create_dict_data(self.decrypt_data(embed_page.encrypted_data, encryption_keys), encrypted_id),
+            alias=embed_page.video_id,
+            headers=self.create_headers(embed_page.url),
+        )
+
+    def fetch_stream_sources(self, ajax_request, encryption_keys):
+        """
+        Sends the AJAX request and decrypts the video sources.
+
+        Args:
+            ajax_request (AjaxRequest): The request to send.
+            encryption_keys (dict): The encryption keys of the embedded video player page.
+
+        Returns:
+            list: The video sources.
+        """
+        request = self.send_post_request(ajax_request.url, ajax_request.params, ajax_request.alias, ajax_request.headers)
+        # Check if the request was successful
+        self.check_response_error(request, request.url)
+        return self.get_source_data(self.create_json_response(request, encryption_keys))
+
+    def run_stage(self, timings, stage, function, *args):
+        """
+        Runs a stage of the stream resolution and records its duration.
+
+        Args:
+            timings (dict): The durations of the stages (updated in place).
+            stage (str): The name of the stage.
+            function (callable): The stage to run.
+            *args: The arguments of the stage.
+
+        Returns:
+            The result of the stage.
+        """
+        start = time.perf_counter()
+        result = function(*args)
+        timings[stage] = time.perf_counter() - start
+        return result
+
+    def resolve_stream(self, ep_url):
+        """
+        Resolves the video stream of an episode in stages, each document is fetched and parsed once:
+        episode page -> embedded player page -> AJAX request (no network) -> video sources.
 
         Args:
             ep_url (str): The URL of the episode to stream.
 
         Returns:
-            str: The URL of the video stream.
+            StreamResolution: The stream URL, the video sources and the time spent in each stage.
         """
         try:
-            embedded_url = self.get_embedded_video_url(ep_url)
-            encryption_keys = self.get_encryption_keys(embedded_url)
-            encrpyted_id = self.encrypt_id(self.create_id(embedded_url), self.get_encryption_keys(self.get_embedded_video_url(ep_url)))
-            # Get the AJAX URL
-            self.ajax_url = self.create_ajax_url(embedded_url)
-            # Send the POST request
-            request = self.send_post_request(self.ajax_url, self.create_dict_data(embedded_url, encryption_keys, encrpyted_id), self.create_id(embedded_url), self.create_headers(embedded_url)) 
-            # Check if the request was successful
-            self.check_response_error(request, request.url)
-            # Return the stream URL
-            return self.get_source_data(self.create_json_response(request, encryption_keys))[0]["file"]
+            timings = {}
+            embedded_url = self.run_stage(timings, "episode_page", self.get_embedded_video_url, ep_url)
+            embed_page = self.run_stage(timings, "embed_page", self.fetch_embed_page, embedded_url)
+            ajax_request = self.run_stage(timings, "ajax_request", self.build_ajax_request, embed_page)
+            sources = self.run_stage(timings, "sources", self.fetch_stream_sources, ajax_request, embed_page.encryption_keys)
+            timings["total"] = sum(timings.values())
+            logger.info(f"Resolved stream for {ep_url} in {timings['total']:.2f}s")
+            return StreamResolution(url=sources[0]["file"], sources=sources, timings=timings)
         except Exception as e:
             raise Exception(f"Error while getting stream URL: {e}")
+
+    def get_streaming_url(self, ep_url):
+        """
+        Given an episode URL, returns the URL of the video stream.
+
+        Args:
+            ep_url (str): The URL of the episode to stream.
+
+        Returns:
+            str: The URL of the video stream.
+        """
+        if self.stream_cache is not None:
+            # Start playback without any scraping request if the stream is still valid
+            stream_url = self.stream_cache.get(ep_url)
+            if stream_url:
+                logger.info(f"Stream cache hit for {ep_url}")
+                return stream_url
+
+        stream_url = self.resolve_stream(ep_url).url
+        if self.stream_cache is not None:
+            self.stream_cache.put_stream(ep_url, stream_url)
+        return stream_url
+
+    def invalidate_stream(self, ep_url):
+        """
+        Removes the cached stream URL of an episode (e.g. when the player could not load it).
+
+        Args:
+            ep_url (str): The URL of the episode.
+        """
+        if self.stream_cache is not None:
+            logger.warning(f"Invalidating the cached stream of {ep_url}")
+            self.stream_cache.invalidate(ep_url)
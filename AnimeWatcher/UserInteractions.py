@@ -10,26 +10,28 @@ class UserInteractions:
     def __init__(self):
         self.quit_symbol = '0'
 
-    def select_anime(self, animes):
+    def select_anime(self, animes, pending=None):
         """
         Displays the search results and prompts the user to select an anime.
 
         Args:
             animes (list): List of anime dictionaries.
+            pending (queue.Queue, optional): Queue receiving the results that are still being fetched. Defaults to None.
 
         Returns:
             int: The selected index of the anime, or 0 to exit.
         """
         
-        return animeList(animes)
+        return animeList(animes, pending)
 
-    def get_user_input(self, max_episode, watched_list=None):
+    def get_user_input(self, max_episode, watched_episodes=None):
         """
         Prompts the user to enter the episode they want to start watching, between the given start and max episodes.
 
         Args:
             start_episode (int): The first episode available to watch.
             max_episode (int): The last episode available to watch.
+            watched_episodes (EpisodeRanges, optional): The watched episodes (shown in green). Defaults to None.
 
         Returns:
             str: The user's input, which is either a valid episode number or '0' to exit.
@@ -37,7 +39,7 @@ class UserInteractions:
         try:
             while True:
                 # Prompt the user to enter the episode they want to start watching
-                user_input = episodesList(max_episode, watched_list)
+                user_input = episodesList(max_episode, watched_episodes)
                 # If the user wants to exit
                 if user_input == self.quit_symbol:
                     exit()
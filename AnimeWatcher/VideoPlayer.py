@@ -25,51 +25,183 @@ class VideoPlayer:
             cls._instance.observer_id = None
             # Set the MPV instance to None
             cls._instance.mpv = None
+            # Set the load failure callback of the current video to None
+            cls._instance.on_load_failure = None
+            # Set the end-file callback of the playlist (binge mode) to None
+            cls._instance.on_end_file = None
+            # The mpv playlist entry of the current video, and the last entry started before it was loaded
+            cls._instance.current_entry_id = None
+            cls._instance.replaced_entry_id = None
+            cls._instance.started_entry_id = None
             # Return the instance of the VideoPlayer class
             return cls._instance
         return cls._instance
 
     def initialize_player(self):
         """
-        Initializes the video player by creating a new MPV instance and setting it to fullscreen mode.
+        Makes sure an MPV instance is running. The instance is kept between videos and is only
+        created again if its IPC socket died (e.g. the user closed the window).
 
         Raises:
             Exception: If there is an error initializing the player.
         """
         try:
             if self.mpv is not None:
-                self.terminate_player()  # Terminate the existing player instance
-            # Create a new MPV instance
+                if self.check_if_socket_is_open():
+                    return  # Reuse the running player
+                self.discard_player()  # Clean up the dead player instance
+            # Create a new MPV instance (its playlist entry ids start over)
             self.mpv = MPV()
+            self.current_entry_id = self.replaced_entry_id = self.started_entry_id = None
             # Make the video player fullscreen by default
             self.mpv.fullscreen = True
+            # Listen for the start and end of the videos (bound once per MPV instance)
+            self.mpv.bind_event("start-file", self.handle_start_file)
+            self.mpv.bind_event("end-file", self.handle_end_file)
         except Exception as e:
             raise e
 
-    def play_video(self, url):
+    def handle_start_file(self, event):
+        """
+        Handles the start-file event of mpv.
+
+        Args:
+            event (dict): The event sent by mpv.
+        """
+        entry_id = event.get("playlist_entry_id")
+        if entry_id is not None:
+            self.started_entry_id = max(entry_id, self.started_entry_id or entry_id)
+
+    def is_current_entry(self, event):
+        """
+        Check if an mpv event belongs to the current video, and not to a video it replaced.
+
+        Args:
+            event (dict): The event sent by mpv.
+
+        Returns:
+            bool: True if the event is about the current video (or can't be told apart), False otherwise.
+        """
+        entry_id = event.get("playlist_entry_id")
+        if entry_id is None:
+            return True  # mpv older than 0.33 doesn't send the entry ids
+        if self.current_entry_id is not None:
+            return entry_id == self.current_entry_id
+        # The entry ids only grow, so the current video has a newer entry than the videos it replaced
+        return self.replaced_entry_id is None or entry_id > self.replaced_entry_id
+
+    def handle_end_file(self, event):
+        """
+        Handles the end-file event of mpv.
+
+        Args:
+            event (dict): The event sent by mpv.
+        """
+        # mpv sends an end-file event with the reason "error" when the media could not be loaded
+        if event.get("reason") == "error":
+            logger.error(f"mpv could not load the video: {event.get('file_error')}")
+            # A late error of the previous video must not invalidate the stream of the current one
+            if self.on_load_failure and self.is_current_entry(event):
+                self.on_load_failure()
+        if self.on_end_file:
+            self.on_end_file(event)
+
+    def load_video(self, url):
+        """
+        Replace the current video of the running player.
+
+        Args:
+            url (str): The URL of the video to be played.
+        """
+        self.replaced_entry_id = self.started_entry_id
+        result = self.mpv.command("loadfile", url, "replace")
+        # mpv 0.38 and later return the playlist entry id of the loaded video
+        self.current_entry_id = result.get("playlist_entry_id") if isinstance(result, dict) else None
+
+    def append_video(self, url):
+        """
+        Append a video to the playlist of the running player (it starts when the current one ends).
+
+        Args:
+            url (str): The URL of the video to be queued.
+        """
+        self.mpv.command("loadfile", url, "append-play")
+
+    def enable_playlist(self, on_end_file):
+        """
+        Prepare the player for a playlist of videos.
+
+        Args:
+            on_end_file (callable): Called with the mpv event every time a playlist entry ends
+                (it replaces the load failure callback of the current video).
+        """
+        self.on_end_file = on_end_file
+        # The load failures are handled per playlist entry by on_end_file, the callback of the
+        # first video would otherwise be called for every entry that fails to load
+        self.on_load_failure = None
+        # Open the next entry while the current one plays so there is no gap between videos
+        self.mpv.command("set_property", "prefetch-playlist", "yes")
+
+    def disable_playlist(self):
+        """
+        Remove the queued videos from the playlist (the current video keeps playing).
+        """
+        self.on_end_file = None
+        try:
+            if self.is_open():
+                self.mpv.command("playlist-clear")
+        except (OSError, BrokenPipeError) as socket_error:
+            logger.error(f"Socket error while clearing the playlist: {socket_error}")
+
+    def play_video(self, url, on_load_failure=None):
         """
         Play a video using the MPV player.
 
         Args:
             url (str): The URL of the video to be played.
+            on_load_failure (callable, optional): Called if mpv fails to load the video. Defaults to None.
 
         Raises:
             Exception: If an error occurs while playing the video.
         """
         try:
-            # Initialize the MPV instance
+            # Make sure the MPV instance is running
             self.initialize_player()
+            self.on_load_failure = on_load_failure
             # Try to play the video
-            self.mpv.play(url)
+            self.load_video(url)
         except (OSError, BrokenPipeError):
             try:
-                self.terminate_player()  # Ensure the player is properly terminated
+                self.discard_player()  # The socket died, start a new player
                 self.initialize_player()
-                self.mpv.play(url)
+                self.on_load_failure = on_load_failure
+                self.load_video(url)
             except Exception as e:
                 logger.error(f"Error while playing video: {e}")
                 raise e
 
+    def discard_player(self):
+        """
+        Forget an MPV instance whose IPC socket died (the singleton itself is kept).
+        """
+        try:
+            self.mpv.terminate()
+        except Exception as e:
+            logger.error(f"Error while discarding the dead player: {e}")
+        self.observer_id = None
+        self.mpv = None
+
+    def stop(self):
+        """
+        Stop the current video, the player keeps running for the next one.
+        """
+        try:
+            if self.is_open():
+                self.on_load_failure = None
+                self.mpv.command("stop")
+        except (OSError, BrokenPipeError) as socket_error:
+            logger.error(f"Socket error while stopping the video: {socket_error}")
+
     def terminate(self):
         """
         Terminate the MPV instance.
@@ -96,7 +228,8 @@ class VideoPlayer:
                     self.mpv.unbind_property_observer(self.observer_id)
                     self.observer_id = None
                 self.terminate()
-                self._instance = None
+                # Reset the singleton on the class (setting it on the instance had no effect)
+                type(self)._instance = None
                 self.mpv = None
         except (OSError, BrokenPipeError) as socket_error:
             logger.error(f"Socket closure error: {socket_error}")
@@ -6,7 +6,12 @@ from AnimeWatcher.UrlOperations import UrlInteractions
 from AnimeWatcher.EpisodeOperations import EpisodeMenu, Menu
 from AnimeWatcher.UserInteractions import UserInteractions
 from AnimeWatcher.TrackerOperations import EpisodeTracker
+from AnimeWatcher.CacheOperations import StreamCache
+from AnimeWatcher.PrefetchOperations import EpisodePrefetcher
+from AnimeWatcher.BingeOperations import BingeSession
 import os
+import queue
+import threading
 # Configure the logger
 logger = setup_logging(AnimeWatcherConfig.ANIME_WATCH_LOG_FILENAME,
                        AnimeWatcherConfig.ANIME_WATCH_LOG_PATH)
@@ -27,8 +32,13 @@ class AnimeWatch:
         # Create an instance of AnimeInteractions
         self.anime_interactions = anime_interactions if anime_interactions else AnimeInteractions(
             self.web_interactions)  
-        # Create an instance of UrlInteractions with the default quality (best)
-        self.url_interactions = UrlInteractions(WebOperationsConfig.QUALITY)
+        # Create an instance of UrlInteractions with the default quality (best) and the stream cache
+        self.stream_cache = StreamCache()
+        self.url_interactions = UrlInteractions(WebOperationsConfig.QUALITY, self.stream_cache)
+        # Resolves the adjacent episodes while the current one plays
+        self.prefetcher = EpisodePrefetcher(self.anime_interactions, self.stream_cache)
+        # The running binge session (None if binge mode is off)
+        self.binge_session = None
         # Create an instance of VideoPlayer
         self.video_player = None  
         # Create an instance of UserInteractions
@@ -40,22 +50,25 @@ class AnimeWatch:
 
     def naviguate_fetch_episodes(self, url, anime_name):
         """
-        naviguates to the given URL and fetches the episodes for the specified anime.
+        Fetches the episodes for the specified anime.
 
         Args:
-            url (str): The URL to naviguate to.
+            url (str): The URL of the anime.
             anime_name (str): The name of the anime.
 
         Returns:
             bool: True if the application needs to be restarted, False otherwise.
         """
         try:
-            # naviguate to the URL
-            self.web_interactions.naviguate(url)
-            # Get the start and max episodes from the page
-            start_episode, max_episode = self.anime_interactions.get_number_episodes()
+            # Get the start and max episodes (cached, or parsed from the anime page without the browser)
+            start_episode, max_episode = self.anime_interactions.get_number_episodes(url)
 
-            return self.handle_episodes(self.user_interactions.get_user_input(max_episode, self.episode_tracker.get_watched_list(anime_name, start_episode, max_episode)),
+            watched_episodes = self.episode_tracker.get_watched_episodes(anime_name)
+            if watched_episodes is None:
+                # Track the anime from now on
+                self.episode_tracker.add_anime(anime_name)
+
+            return self.handle_episodes(self.user_interactions.get_user_input(max_episode, watched_episodes),
                                         start_episode, 
                                         max_episode, 
                                         url, 
@@ -69,6 +82,9 @@ class AnimeWatch:
             return False
     def close_session(self):
         try:
+            # Stop the background work
+            self.stop_binge()
+            self.prefetcher.shutdown()
             # Close the video player
             self.video_player.terminate_player()
             # exit the program
@@ -91,16 +107,23 @@ class AnimeWatch:
         """
         episode_menu = EpisodeMenu(start_episode, max_episode)
         episode_menu.display_menu()
-        self.url_interactions = UrlInteractions("best")
 
         while True:
             user_choice = input("Enter your choice: ").lower().strip()
             
             if user_choice in episode_menu.available_choices():
-                choice_result = episode_menu.handle_choice(user_choice, int(prompt))
+                # In binge mode, the episode being played may have changed since the menu was shown
+                current_episode = self.binge_session.current_episode if self.binge_session else int(prompt)
+                if user_choice != self.episode_menu.Binge:
+                    # Any other choice ends binge mode
+                    self.stop_binge()
+                choice_result = episode_menu.handle_choice(user_choice, current_episode)
                 
                 if choice_result == self.episode_menu.ChangeAnime:
-                    self.video_player.terminate_player()
+                    # The prefetched episodes belong to the previous anime
+                    self.prefetcher.cancel()
+                    # Keep mpv running for the next anime
+                    self.video_player.stop()
                     return choice_result
                 elif choice_result == self.episode_menu.Quit:
                     self.close_session()
@@ -125,12 +148,22 @@ class AnimeWatch:
             Exception: If there is an error formatting or playing the episode.
         """
         try:
+            # Use the episode resolved in the background if there is one
+            prefetched = self.prefetcher.take(url, int(prompt))
+            if prefetched:
+                episode_url, stream_url = prefetched
+                self.play_episode(episode_url, stream_url)
+                return episode_url
+
+            episode_url = self.anime_interactions.format_episode_link(url, anime_name, prompt)
             # Play the episode with the formatted URL
-            self.play_episode(self.anime_interactions.format_episode_link(url, anime_name, prompt))
+            self.play_episode(episode_url)
             # Return the formatted episode URL
-            return self.anime_interactions.format_episode_link(url, anime_name, prompt)
+            return episode_url
         except Exception as e:
             logger.error(f"Error formatting or playing episode: {e}")
+            # The learned slug may be wrong, probe the candidates again next time
+            self.anime_interactions.forget_episode_slug(url)
             raise
 
     def handle_episodes(self, prompt, start_episode, max_episode, url, anime_name):
@@ -147,37 +180,78 @@ class AnimeWatch:
             bool: True if the user wants to change the anime, False if the user wants to quit the program.
         """
         try:
+            current_episode, current_episode_url = None, None
             while True:
                 if prompt == self.episode_menu.ChangeAnime:
                     return True
                 elif prompt == self.episode_menu.Quit:
                     return False
-                self.episode_tracker.update_anime(anime_name, int(prompt))
-                self.format_and_play_episode(prompt, url, anime_name)
-                prompt = self.handle_user_choice(prompt, start_episode, max_episode)
+                elif prompt == self.episode_menu.Binge:
+                    if self.binge_session is None or not self.binge_session.is_queueing():
+                        if self.binge_session:
+                            # Binge mode stopped on an episode it could not load, start again from the one being played
+                            current_episode, current_episode_url = self.binge_session.current_entry
+                        # Queue the next episodes after the one being played
+                        self.start_binge(url, anime_name, current_episode, current_episode_url, max_episode)
+                    current_episode = self.binge_session.current_episode
+                else:
+                    current_episode = int(prompt)
+                    self.episode_tracker.update_anime(anime_name, current_episode)
+                    current_episode_url = self.format_and_play_episode(prompt, url, anime_name)
+                    # Resolve the adjacent episodes while this one plays
+                    self.prefetcher.prefetch(url, anime_name, current_episode, start_episode, max_episode)
+                prompt = self.handle_user_choice(current_episode, start_episode, max_episode)
         except ValueError as ve:
             logger.error(f"Error while handling episodes: {ve}")
         except Exception as e:
             logger.error(f"Unexpected error while handling episodes: {e}")
         return False
 
-    def play_episode(self, episode_url):
+    def start_binge(self, url, anime_name, current_episode, current_episode_url, max_episode):
+        """
+        Starts binge mode: the episodes after the current one are resolved in the background
+        and played one after the other by mpv.
+
+        Args:
+            url (str): The URL of the anime.
+            anime_name (str): The name of the anime.
+            current_episode (int): The episode being played.
+            current_episode_url (str): The URL of the episode being played.
+            max_episode (int): The last episode available to watch.
+        """
+        self.stop_binge()
+        # The binge session resolves the next episodes itself
+        self.prefetcher.cancel()
+        self.binge_session = BingeSession(self.video_player, self.anime_interactions, self.episode_tracker,
+                                          url, anime_name, current_episode, max_episode,
+                                          current_episode_url, self.stream_cache)
+        self.binge_session.start()
+        print("Binge mode on, the next episodes will play automatically.")
+
+    def stop_binge(self):
+        """ Stops binge mode if it is running (the episode being played keeps playing). """
+        if self.binge_session:
+            self.binge_session.stop()
+            self.binge_session = None
+
+    def play_episode(self, episode_url, stream_url=None):
         """
         Plays the episode at the given URL.
 
         Args:
             episode_url (str): The URL of the episode to play.
+            stream_url (str, optional): The stream URL if it is already resolved. Defaults to None.
 
         Raises:
             Exception: If an error occurs while playing the episode.
         """
         try:
-            if self.video_player is None or self.video_player.is_open():
-                # Create a new instance of VideoPlayer if one
-                # doesn't exist or if the current instance is closed
-                self.video_player = VideoPlayer()
-                # Try to play the episode using the video player instance
-                self.video_player.play_video(self.url_interactions.get_streaming_url(episode_url))
+            # Get the VideoPlayer instance (the running mpv is reused between episodes)
+            self.video_player = VideoPlayer()
+            # Try to play the episode using the video player instance
+            # Drop the cached stream if mpv can't load it (e.g. it expired early)
+            self.video_player.play_video(stream_url or self.url_interactions.get_streaming_url(episode_url),
+                                         on_load_failure=lambda: self.url_interactions.invalidate_stream(episode_url))
         except Exception as e:
             # If an error occurs while getting the streaming URL, log an error and raise an exception
             logger.error(f"Error while playing episode: {e}")
@@ -207,39 +281,71 @@ class Main:
         """
         Prompts the user to enter the anime they want to watch,
         finds the animes matching the user's input, and returns
-        the found animes along with the user's input.
+        the search results along with the user's input.
 
         Returns:
-            tuple: A tuple containing the found animes and the user's input.
+            tuple: A tuple containing the search results (yielded page by page) and the user's input.
         """
         try:
             # Prompt the user to enter the anime they want to watch
             user_input = self.anime_watch.anime_interactions.format_anime_name_from_input(input("Enter the anime you want to watch: "))
 
             # Return the animes found
-            return self.anime_watch.anime_interactions.find_anime_website(user_input), user_input
+            return self.anime_watch.anime_interactions.stream_anime_website(user_input), user_input
         except Exception as e:
             logger.error(f"Error while searching for anime: {e}")
             # If an error occurs, exit the program
             exit()
 
+    def feed_search_pages(self, pages, pending, stop_event):
+        """
+        Sends the remaining pages of the search results to the anime picker.
+
+        Args:
+            pages (generator): The remaining pages of the search results.
+            pending (queue.Queue): The queue read by the anime picker.
+            stop_event (threading.Event): Set once the user made a choice (the remaining pages are dropped).
+        """
+        try:
+            for page in pages:
+                if stop_event.is_set():
+                    break
+                pending.put(page)
+        except Exception as e:
+            logger.error(f"Error while fetching the remaining search pages: {e}")
+        finally:
+            # Signal the end of the results
+            pending.put(None)
 
     def search_and_select_anime(self):
         """
         Searches for an anime based on user input and allows the user to select from the search results.
 
+        The picker is shown as soon as the first page of results is available, the other pages
+        are added to it as they arrive.
+
         Returns:
             The selected anime object or None if the user cancels the selection.
         """
         try:
             while True:
-                animes, user_input = self.find_anime_from_input()
+                pages, user_input = self.find_anime_from_input()
 
+                animes = next(pages, [])
                 if not animes:
                     print(f"{user_input} was not found.")
                     continue
 
-                selected_index = self.user_interactions.select_anime(animes)
+                # Fetch the remaining pages in the background
+                pending = queue.Queue()
+                stop_event = threading.Event()
+                threading.Thread(target=self.feed_search_pages, args=(pages, pending, stop_event), daemon=True).start()
+
+                try:
+                    selected_index = self.user_interactions.select_anime(animes, pending)
+                finally:
+                    stop_event.set()
+
                 if selected_index == 0:
                     return None
 
@@ -296,6 +402,9 @@ class Main:
         except Exception as e:
             logger.error(f"Unexpected exception: {e}")
         finally:
+            self.anime_watch.stop_binge()
+            self.anime_watch.prefetcher.shutdown()
+            self.anime_watch.episode_tracker.close()
             self.anime_watch.web_interactions.cleanup()
             print("Cleanup completed.")
 
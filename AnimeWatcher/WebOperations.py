@@ -1,11 +1,19 @@
 
 import time
 from selenium.webdriver.common.by import By
-from Config.config import WebOperationsConfig, AnimeWatcherConfig, WebElementsConfig
+from Config.config import WebOperationsConfig, AnimeWatcherConfig, WebElementsConfig, DriverConfig, SessionConfig, CacheConfig
 from Config.logs_config import setup_logging
 from Driver.driver_config import driver_setup
+from Driver.browser_daemon import connect_to_daemon, touch_heartbeat
+from AnimeWatcher.SearchOperations import SearchInteractions
+from AnimeWatcher.SessionOperations import create_session
+from AnimeWatcher.SlugOperations import SlugCache
+from AnimeWatcher.CatalogIndex import CatalogIndex
+from AnimeWatcher.CacheOperations import TTLCache
 import re
-import requests
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import unquote
 from bs4 import BeautifulSoup
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -17,13 +25,81 @@ logger = setup_logging(AnimeWatcherConfig.ANIME_WATCH_LOG_FILENAME,
 
 
 class WebInteractions:
+    # Field attribute used to read the text of an element in extract_elements
+    TEXT = "text"
+    # Reads the fields of every element matching the selector in the browser, returned as one JSON payload
+    # (properties such as href are read resolved, other attributes as written in the HTML)
+    BULK_EXTRACT_SCRIPT = """
+        const [selector, fields] = arguments;
+        return Array.from(document.querySelectorAll(selector), element => {
+            const item = {};
+            for (const [name, [childSelector, attribute]] of Object.entries(fields)) {
+                const target = childSelector ? element.querySelector(childSelector) : element;
+                if (!target) {
+                    item[name] = null;
+                } else if (attribute === 'text') {
+                    item[name] = target.innerText;
+                } else {
+                    item[name] = attribute in target ? target[attribute] : target.getAttribute(attribute);
+                }
+            }
+            return item;
+        });
+    """
+
     def __init__(self):
         """
         Initializes the WebOperations class.
+
+        The browser is not started here, it is created the first time the driver is used.
         """
-        self.driver = driver_setup()
+        self._driver = None
+        self._driver_lock = threading.Lock()
+        # True if the driver is attached to the browser daemon (the browser must be kept open)
+        self.attached_to_daemon = False
         self.cleanup_done = False
 
+    @property
+    def driver(self):
+        """
+        The Selenium WebDriver, created on first use.
+
+        Returns:
+            WebDriver: The configured web driver instance.
+        """
+        if self._driver is None:
+            with self._driver_lock:
+                # Check again in case another thread created the driver while waiting for the lock
+                if self._driver is None:
+                    self._driver = self.create_driver()
+        return self._driver
+
+    def create_driver(self):
+        """
+        Creates the web driver, attached to the warm browser daemon if it is enabled.
+
+        Returns:
+            WebDriver: The configured web driver instance.
+        """
+        if DriverConfig.USE_BROWSER_DAEMON:
+            try:
+                driver = connect_to_daemon()
+                self.attached_to_daemon = True
+                return driver
+            except Exception as e:
+                logger.error(f"Error while attaching to the browser daemon, starting a new browser: {e}")
+        logger.info("Starting the browser")
+        return driver_setup()
+
+    def has_driver(self):
+        """
+        Check if the browser was started.
+
+        Returns:
+            bool: True if the driver was created, False otherwise.
+        """
+        return self._driver is not None
+
     def cleanup(self):
         """
         Performs cleanup operations, ensuring the browser driver is properly closed.
@@ -35,9 +111,15 @@ class WebInteractions:
             return
 
         try:
-            if self.driver is not None:
-                self.driver.quit()
-                print("\nBrowser closed")
+            # Only close the browser if it was started (never start it just to close it)
+            if self.has_driver():
+                if self.attached_to_daemon:
+                    # Only stop our ChromeDriver, the daemon keeps the browser warm for the next run
+                    self._driver.service.stop()
+                else:
+                    self._driver.quit()
+                    print("\nBrowser closed")
+                self._driver = None
             self.cleanup_done = True
         except Exception as e:
             logger.error(f"Error during browser cleanup: {e}")
@@ -56,6 +138,9 @@ class WebInteractions:
         try:
             # naviguate to the URL
             self.driver.get(url)
+            if self.attached_to_daemon:
+                # Keep the daemon alive while it is being used
+                touch_heartbeat()
         except Exception as e:
             logger.error(f"Error while navigating to {url}: {e}")
             raise  # Re-raise the exception to stop further execution
@@ -94,6 +179,33 @@ class WebInteractions:
             raise NoSuchElementException(
                 f"Element not found: {type_name}='{value}' after {timeout} seconds")
 
+    def extract_elements(self, selector, fields, timeout=0):
+        """
+        Extracts data from every element matching the CSS selector with a single script call
+        (instead of one WebDriver round-trip per element and attribute).
+
+        Args:
+            selector (str): The CSS selector of the elements.
+            fields (dict): The fields to extract, {name: (child_selector, attribute)}. The child selector
+                is None to read the element itself, the attribute is WebInteractions.TEXT to read its text.
+            timeout (int, optional): Seconds to wait for the first element to be present. Defaults to 0 (no wait).
+
+        Returns:
+            list: A dictionary of the fields of each element (None if a child or attribute is missing).
+        """
+        if timeout:
+            try:
+                WebDriverWait(self.driver, timeout).until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
+            except TimeoutException:
+                return []
+        try:
+            return self.driver.execute_script(self.BULK_EXTRACT_SCRIPT, selector, {
+                name: [child_selector, attribute] for name, (child_selector, attribute) in fields.items()
+            }) or []
+        except Exception as e:
+            logger.error(f"Error while extracting '{selector}': {e}")
+            raise
+
     def format_anime_url(self, page_number):
         """Function to format the anime URL with the page number
 
@@ -119,118 +231,182 @@ class AnimeInteractions:
             web_interactions: The web interactions object used for performing web operations.
         """
         self.web_interactions = web_interactions
+        # Pooled HTTP session shared by the requests-based scraping
+        self.session = create_session()
+        # HTTP-only search (Selenium is only used as a fallback)
+        self.search_interactions = SearchInteractions(self.session)
+        # Lock guarding the WebDriver (the search pages are processed from several threads)
+        self.driver_lock = threading.Lock()
+        # Episode link slugs learned per anime (avoids probing the candidate links for every episode)
+        self.slug_cache = SlugCache()
+        # Inverted index over the local catalog (built by animefetch.py), loaded on the first search
+        self.catalog_index = CatalogIndex(self.format_anime_name)
+        # Episode range per anime URL (reopening an anime costs no request)
+        self.episode_count_cache = TTLCache(CacheConfig.EPISODE_COUNT_CACHE_FILE, CacheConfig.EPISODE_COUNT_TTL)
+
+    def find_pagination_links(self):
+        """
+        Find and return the page numbers from the pagination links of the page loaded in the browser.
 
-    def find_episodes_body(self):
+        Returns:
+            list: A list of page numbers extracted from pagination links.
         """
-        Finds and returns the episodes body element on the webpage.
+        try:
+            # Extract every page number in one script call
+            pagination_links = self.web_interactions.extract_elements(
+                f"{WebOperationsConfig.ANIME_NAME_PAGINATION} {WebOperationsConfig.UL_PAGINATION_LIST}",
+                {'page': (None, WebOperationsConfig.DATA_PAGE)})
 
-        Returns:
-            WebElement: The episodes body element.
+            page_numbers = [int(link['page']) for link in pagination_links if (link['page'] or "").isdigit()]
 
-        Raises:
-            Exception: If the episodes list is not found.
+            # If no valid page numbers are found, return a default page number list [1]
+            return sorted(set(page_numbers)) if page_numbers else [1]
+
+        except Exception as e:
+            logger.error(f"Error while finding pagination links: {e}")
+            raise
+
+    def process_anime_list_page(self, input_anime_name, anime_list, page_number=1, use_http=True):
+        """
+        Process a single page of the anime list and append the results to anime_list.
+
+        The page is fetched over HTTP first, the browser is only used if the HTTP parser
+        detects a challenge page or an empty result.
+
+        Args:
+            input_anime_name (str): The anime name (already formatted for the URL).
+            anime_list (list): The list to append the results to.
+            page_number (int, optional): The page number. Defaults to 1.
+            use_http (bool, optional): If False, the page is fetched with Selenium directly. Defaults to True.
         """
         try:
-            # Find and return the episodes body
-            return self.web_interactions.find_elements(type_name=By.CLASS_NAME, value=WebOperationsConfig.ANIME_VIDEO_BODY, timeout=5, multiple=False)
+            if use_http:
+                page = self.search_interactions.fetch_search_page(input_anime_name, page_number)
+                if page is not None and page[0]:
+                    anime_list.extend(page[0])
+                    return
+
+            # The single WebDriver can only process one page at a time
+            with self.driver_lock:
+                self.web_interactions.naviguate(WebOperationsConfig.GOGO_ANIME_SEARCH.format(
+                    input_anime_name) + f"&page={page_number}")
+                anime_list.extend(self.extract_anime_list(page_number))
+
+        except NoSuchElementException as e:
+            logger.error(
+                f"No anime list elements found on page {page_number} for '{input_anime_name}': {e}")
+
         except Exception as e:
-            logger.error(f"Error while finding episodes body: {e}")
-            raise Exception("Episodes list not found") from e
+            logger.error(
+                f"Error while processing anime list page {page_number} for '{input_anime_name}': {e}")
+            raise
 
-    def find_episodes(self, episodes_body):
+    def extract_anime_list(self, page_number=1):
         """
-        Finds and returns the episodes element from the given episodes_body.
+        Extract the titles and links of the search results loaded in the browser (in one script call).
 
         Args:
-            episodes_body: The body element containing the episodes.
+            page_number (int, optional): The page number (for the error message). Defaults to 1.
 
         Returns:
-            The episodes element if found.
+            list: A list of dictionaries containing the title and link of each anime.
 
         Raises:
-            Exception: If episodes element is not found.
+            NoSuchElementException: If there is no result on the page.
         """
-        try:
-            # Find the episodes element
-            episodes = self.web_interactions.find_elements(
-                By.ID, WebOperationsConfig.EPISODE_PAGE, element=episodes_body, timeout=5, multiple=False)
-            if episodes is None:
-                # If the episodes element is not found, raise an exception
-                raise Exception("Episodes not found")
-            # Return the episodes element
-            return episodes
+        items = self.web_interactions.extract_elements(
+            f"{WebOperationsConfig.UL_ITEMS} > {WebElementsConfig.LI_ELEMENT}",
+            {'text': (None, WebInteractions.TEXT), 'link': (WebElementsConfig.HYPERLINK, WebElementsConfig.HREF)})
+
+        anime_list = [{'title': (item['text'] or "").split('\n')[0], 'link': item['link']}
+                      for item in items if item['link']]
+        if not anime_list:
+            raise NoSuchElementException(f"No anime list elements found on page {page_number}")
+        return anime_list
 
+    def format_anime_name_from_input(self, input_anime_name):
+        try:
+            # Format the anime name (replace spaces with %20)
+            return input_anime_name.replace(' ', '%20')
         except Exception as e:
-            logger.error(f"Error while finding episodes: {e}")
+            logger.error(f"Error while formatting anime name from input: {e}")
             raise
 
-    def find_pagination_links(self, pagination_div):
+    def fetch_anime_list_page(self, input_anime_name, page_number):
         """
-        Find and return the pagination links from the pagination div.
+        Fetches a single page of the search results.
 
         Args:
-            pagination_div (WebElement): The pagination div element.
+            input_anime_name (str): The anime name (already formatted for the URL).
+            page_number (int): The page number.
 
         Returns:
-            list: A list of page numbers extracted from pagination links.
+            list: The animes found on the page.
         """
-        try:
-            # Find all pagination links within the pagination div
-            pagination_links = pagination_div.find_elements(
-                By.CSS_SELECTOR, WebOperationsConfig.UL_PAGINATION_LIST)
+        anime_list = []
+        self.process_anime_list_page(input_anime_name, anime_list, page_number)
+        return anime_list
 
-            # Extract page numbers from pagination links
-            page_numbers = [int(link.get_attribute('data-page'))
-                            for link in pagination_links if link.get_attribute('data-page')]
+    def search_catalog(self, input_anime_name):
+        """
+        Finds anime in the local catalog, without any request.
 
-            # If no valid page numbers are found, return a default page number list [1]
-            return page_numbers if page_numbers else [1]
+        Args:
+            input_anime_name (str): The name of the anime to search for (already formatted for the URL).
 
+        Returns:
+            list: The animes found, or None if the catalog can't answer (no catalog, stale catalog or no match).
+        """
+        try:
+            return self.catalog_index.search(unquote(input_anime_name))
         except Exception as e:
-            logger.error(f"Error while finding pagination links: {e}")
-            raise
+            logger.error(f"Error while searching the catalog for '{input_anime_name}': {e}")
+            return None
 
-    def process_anime_list_page(self, input_anime_name, anime_list, page_number=1):
+    def stream_anime_website(self, input_anime_name):
         """
-        Process a single page of the anime list and append the results to anime_list.
-        """
-        try:
-            self.web_interactions.naviguate(WebOperationsConfig.GOGO_ANIME_SEARCH.format(
-                input_anime_name) + f"&page={page_number}")
+        Finds anime on the website and yields the results page by page.
 
-            ul_items = self.web_interactions.driver.find_element(
-                By.CSS_SELECTOR, 'ul.items')
+        The first page is fetched over HTTP to find the pagination, the remaining pages are then
+        fetched in parallel (bounded by WebOperationsConfig.SEARCH_MAX_WORKERS) and yielded in page order
+        as soon as they are available. Selenium is only used as a fallback. The local catalog is
+        searched first, the website is only searched on a miss or if the catalog is stale.
 
-            li_elements = ul_items.find_elements(
-                By.CSS_SELECTOR, WebElementsConfig.LI_ELEMENT)
+        Args:
+            input_anime_name (str): The name of the anime to search for.
 
-            if not li_elements:
-                raise NoSuchElementException(
-                    f"No anime list elements found on page {page_number}")
+        Yields:
+            list: The animes found on each page.
+        """
+        catalog_results = self.search_catalog(input_anime_name)
+        if catalog_results:
+            yield catalog_results
+            return
 
-            # Process each li element and extract title and link
-            for li in li_elements:
-                anime_list.append({
-                    'title': li.text.split('\n')[0],
-                    'link': li.find_element(By.CSS_SELECTOR, WebElementsConfig.HYPERLINK).get_attribute(WebElementsConfig.HREF)
-                })
+        first_page = self.search_interactions.fetch_search_page(input_anime_name)
+        if first_page is None or not first_page[0]:
+            logger.info(f"HTTP search returned no result for '{input_anime_name}', falling back to Selenium")
+            yield self.find_anime_website_selenium(input_anime_name)
+            return
 
-        except NoSuchElementException as e:
-            logger.error(
-                f"No anime list elements found on page {page_number} for '{input_anime_name}': {e}")
+        anime_list, page_numbers = first_page
+        # Show the first page while the others are being fetched
+        yield anime_list
 
-        except Exception as e:
-            logger.error(
-                f"Error while processing anime list page {page_number} for '{input_anime_name}': {e}")
-            raise
+        remaining_pages = [page_number for page_number in page_numbers if page_number != 1]
+        if not remaining_pages:
+            return
 
-    def format_anime_name_from_input(self, input_anime_name):
+        executor = ThreadPoolExecutor(max_workers=min(WebOperationsConfig.SEARCH_MAX_WORKERS, len(remaining_pages)))
         try:
-            # Format the anime name (replace spaces with %20)
-            return input_anime_name.replace(' ', '%20')
-        except Exception as e:
-            logger.error(f"Error while formatting anime name from input: {e}")
-            raise
+            futures = [executor.submit(self.fetch_anime_list_page, input_anime_name, page_number)
+                       for page_number in remaining_pages]
+            # Wait for the pages in order so the results stay sorted
+            for future in futures:
+                yield future.result()
+        finally:
+            # Drop the pages that are not needed anymore (e.g. the user already picked an anime)
+            executor.shutdown(wait=False, cancel_futures=True)
 
     def find_anime_website(self, input_anime_name):
         """
@@ -243,105 +419,98 @@ class AnimeInteractions:
             list: A list of anime found on the website.
         """
         try:
-            anime_list = []  # Initialize the anime list
-
-            # naviguate to the anime search page
-            self.web_interactions.naviguate(
-                WebOperationsConfig.GOGO_ANIME_SEARCH.format(input_anime_name))
-
-            # Check for pagination (multiple pages of results)
-            pagination_div = self.web_interactions.find_elements(
-                By.CSS_SELECTOR, WebOperationsConfig.ANIME_NAME_PAGINATION, timeout=5, multiple=False)
-
-            if pagination_div:
-                # Iterate through the page numbers
-                for page_number in self.find_pagination_links(pagination_div):
-                    # Process each page of the anime list
-                    self.process_anime_list_page(
-                        input_anime_name, anime_list, page_number)
-            else:
-                # Process the first page if no pagination
-                self.process_anime_list_page(input_anime_name, anime_list)
-
-            return anime_list  # Return the collected anime list
-
-        except NoSuchElementException as e:
-            logger.error(f"No anime found for '{input_anime_name}': {e}")
-            return []  # Return an empty list if no anime found
-
+            return [anime for page in self.stream_anime_website(input_anime_name) for anime in page]
         except Exception as e:
             logger.error(
                 f"Error while finding anime website for '{input_anime_name}': {e}")
             raise
 
-    def find_li_elements(self, episodes):
+    def find_anime_website_selenium(self, input_anime_name):
         """
-        Find and return a list of <li> elements within the given 'episodes' element.
+        Finds anime on the website by driving the browser.
 
         Args:
-            episodes (WebElement): The parent element containing the <li> elements.
+            input_anime_name (str): The name of the anime to search for.
 
         Returns:
-            list: A list of <li> elements found within the 'episodes' element.
-
-        Raises:
-            Exception: If the 'episodes' element is not found or if an error occurs during the process.
+            list: A list of anime found on the website.
         """
         try:
-            # Find the <li> elements
-            li_elements = episodes.find_elements(
-                By.CSS_SELECTOR, WebElementsConfig.LI_ELEMENT)
-            if li_elements is None:
-                # If no <li> elements are found, raise an exception
-                raise Exception("Episodes list not found")
-            # Return the <li> elements
-            return li_elements
+            with self.driver_lock:
+                # naviguate to the anime search page
+                self.web_interactions.naviguate(
+                    WebOperationsConfig.GOGO_ANIME_SEARCH.format(input_anime_name))
+
+                # Check for pagination (multiple pages of results) and read the first page while it is loaded
+                page_numbers = self.find_pagination_links()
+                anime_list = self.extract_anime_list()
+
+            # Process the other pages of the anime list
+            for page_number in page_numbers:
+                if page_number != 1:
+                    self.process_anime_list_page(
+                        input_anime_name, anime_list, page_number, use_http=False)
 
-        except Exception as e:
-            logger.error(f"Error while finding li elements: {e}")
-            raise
+            return anime_list  # Return the collected anime list
 
-    def get_episode_range(self, li_element):
+        except NoSuchElementException as e:
+            logger.error(f"No anime found for '{input_anime_name}': {e}")
+            return []  # Return an empty list if no anime found
+
+    def get_number_episodes(self, url=None):
         """
-        Get the episode range from the given li_element.
+        Retrieves the number of episodes for the anime.
+
+        The episode range is read from the cache, or parsed from the raw anime page with a single
+        request. The browser is only used as a fallback (or if no URL is given, on the current page).
 
         Args:
-            li_element (WebElement): The li element containing the episode information.
+            url (str, optional): The URL of the anime. Defaults to None (the page loaded in the browser).
 
         Returns:
-            Two variables containing the start and end episode numbers.
-
+            tuple: The minimum and maximum episode numbers.
         Raises:
-            Exception: If there is an error while getting the episode range.
+            Exception: If there is an error while getting the number of episodes.
         """
         try:
-            # Get the episode link
-            episode_link = li_element.find_element(
-                By.CSS_SELECTOR, WebElementsConfig.HYPERLINK)
-            # Return the episode range
-            return int(episode_link.get_attribute(WebOperationsConfig.EP_START)), int(episode_link.get_attribute(WebOperationsConfig.EP_END))
+            if url is None:
+                return self.get_number_episodes_selenium()
+
+            cached_range = self.episode_count_cache.get(url)
+            if cached_range is not None:
+                return tuple(cached_range)
+
+            episode_range = self.search_interactions.fetch_episode_range(url)
+            if episode_range is None:
+                logger.info(f"HTTP episode range fetch failed for {url}, falling back to Selenium")
+                with self.driver_lock:
+                    self.web_interactions.naviguate(url)
+                    episode_range = self.get_number_episodes_selenium()
+            self.episode_count_cache.put(url, list(episode_range))
+            return episode_range
         except Exception as e:
-            logger.error(f"Error while getting episode range: {e}")
+            logger.error(f"Error while getting number of episodes: {e}")
             raise
 
-    def get_number_episodes(self):
+    def get_number_episodes_selenium(self):
         """
-        Retrieves the number of episodes for the anime.
+        Retrieves the number of episodes for the anime loaded in the browser.
 
         Returns:
             tuple: The minimum and maximum episode numbers.
-        Raises:
-            Exception: If there is an error while getting the number of episodes.
         """
-        try:
-            max_end = 1
-            for li_element in self.find_li_elements(self.find_episodes(self.find_episodes_body())):
-                _, ep_end = self.get_episode_range(li_element)
-                max_end = max(max_end, ep_end)
-            return 1, max_end
-        except Exception as e:
-            logger.error(f"Error while getting number of episodes: {e}")
-            raise
+        # Read every episode range in one script call
+        episode_links = self.web_interactions.extract_elements(
+            f".{WebOperationsConfig.ANIME_VIDEO_BODY} #{WebOperationsConfig.EPISODE_PAGE} {WebElementsConfig.LI_ELEMENT} {WebElementsConfig.HYPERLINK}",
+            {'ep_end': (None, WebOperationsConfig.EP_END)}, timeout=5)
+        if not episode_links:
+            raise Exception("Episodes list not found")
+
+        max_end = 1
+        for episode_link in episode_links:
+            if (episode_link['ep_end'] or "").isdigit():
+                max_end = max(max_end, int(episode_link['ep_end']))
+        return 1, max_end
 
     def format_anime_name_from_url(self, url, prompt):
         """
@@ -357,16 +526,28 @@ class AnimeInteractions:
             Exception: If there is an error while formatting the anime name.
         """
         try:
-            # split the url by / and get the last part (the url looks like https://gogoanime3.net/anime-name)
-            # remove the - between the words
-            # Remove unwanted symbols except hyphen
-            # Remove consecutive hyphens (e.g., 'anime--name' becomes 'anime-name')
             # Return the constructed episode url
-            return self.construct_episode_link(re.sub(r'[\s-]+', '-', re.sub(r'[^a-zA-Z0-9\s-]', '', url.split('/')[-1])).lower(), prompt)
+            return self.construct_episode_link(self.format_anime_slug_from_url(url), prompt)
         except Exception as e:
             logger.error(f"Error while formatting anime name url: {e}")
             raise
 
+    def format_anime_slug_from_url(self, url):
+        """
+        Extracts the anime slug (the anime part of the episode links) from the given URL.
+
+        Args:
+            url (str): The URL of the anime.
+
+        Returns:
+            str: The anime slug.
+        """
+        # split the url by / and get the last part (the url looks like https://gogoanime3.net/anime-name)
+        # remove the - between the words
+        # Remove unwanted symbols except hyphen
+        # Remove consecutive hyphens (e.g., 'anime--name' becomes 'anime-name')
+        return re.sub(r'[\s-]+', '-', re.sub(r'[^a-zA-Z0-9\s-]', '', url.split('/')[-1])).lower()
+
     def format_anime_name(self, anime_name):
         """
         Formats the given anime name by removing special characters, converting to lowercase,
@@ -389,7 +570,8 @@ class AnimeInteractions:
 
     def check_url_status(self, url):
         """
-        Check the status of a given URL.
+        Check the status of a given URL with a lightweight request (HEAD, or a one-byte ranged GET
+        if the server doesn't support HEAD) on the pooled session.
 
         Args:
             url (str): The URL to check.
@@ -401,7 +583,13 @@ class AnimeInteractions:
             Exception: If an error occurs while checking the URL status.
         """
         try:
-            return requests.get(url).status_code
+            response = self.session.head(url, allow_redirects=True, timeout=SessionConfig.PROBE_TIMEOUT)
+            if response.status_code not in (405, 501):
+                return response.status_code
+            # HEAD is not allowed, only download the first byte of the page
+            with self.session.get(url, headers={"Range": "bytes=0-0"}, stream=True, timeout=SessionConfig.PROBE_TIMEOUT) as response:
+                # 206: partial content
+                return 200 if response.status_code == 206 else response.status_code
         except Exception as e:
             logger.error(f"Error while checking URL status: {e}")
             raise
@@ -419,10 +607,30 @@ class AnimeInteractions:
         """
         return f"https://gogoanime3.net/{formatted_anime_name}-episode-{episode_number}"
 
+    def get_slug_candidates(self, url, anime_name):
+        """
+        Get the candidate slugs for the episode links of an anime, without the ones known to be wrong.
+
+        Args:
+            url (str): The base anime URL.
+            anime_name (str): The name of the anime.
+
+        Returns:
+            list: The candidate slugs, the one from the URL first.
+        """
+        candidates = []
+        for slug in (self.format_anime_slug_from_url(url), self.format_anime_name(anime_name)):
+            if slug not in candidates and not self.slug_cache.is_bad(url, slug):
+                candidates.append(slug)
+        return candidates
+
     def format_episode_link(self, url, anime_name, episode_number):
         """
         Formats the episode link based on the base anime URL and the episode number.
 
+        The slug that worked for the anime is remembered, so only the first episode
+        of an anime needs to probe the candidate links.
+
         Args:
             url (str): The base anime URL.
             anime_name (str): The name of the anime.
@@ -435,24 +643,23 @@ class AnimeInteractions:
             Exception: If there is an error while formatting the episode link.
         """
         try:
-            # Check if the episode link exists (returns 200 if it exists)
-            if self.check_url_status(self.format_anime_name_from_url(url, episode_number)) == 200:
-                return self.format_anime_name_from_url(url, episode_number)
+            # Build the link directly if the slug of the anime is known
+            slug = self.slug_cache.get_slug(url)
+            if slug:
+                return self.construct_episode_link(slug, episode_number)
 
-            # If the episode link did not exist, try the original and alternative links
-            return self.retry_format_episode_link(self.construct_episode_link(
-                self.format_anime_name(anime_name), episode_number), self.format_anime_name(anime_name), episode_number)
+            return self.retry_format_episode_link(url, self.get_slug_candidates(url, anime_name), episode_number)
         except Exception as e:
             logger.error(f"Error while formatting episode link: {e}")
             raise
 
-    def retry_format_episode_link(self, original_url, formatted_anime_name, episode_number):
+    def retry_format_episode_link(self, url, candidates, episode_number):
         """
-        Retry logic for formatting episode link.
+        Probe the candidate slugs concurrently and remember the first one that works.
 
         Args:
-            original_url (str): The original URL to check.
-            formatted_anime_name (str): The formatted name of the anime.
+            url (str): The base anime URL.
+            candidates (list): The candidate slugs.
             episode_number (int): The episode number.
 
         Returns:
@@ -461,15 +668,38 @@ class AnimeInteractions:
         Raises:
             Exception: If the episode is not found.
         """
-        if self.check_url_status(original_url) == 200:
-            return original_url
-
-        if not hasattr(self, '_retry_attempted'):
-            alternative_url = self.construct_episode_link(
-                formatted_anime_name, episode_number)
+        if not candidates:
+            raise Exception(f"Episode {episode_number} not found")
 
-            if self.check_url_status(alternative_url) == 200:
-                self._retry_attempted = True
-                return alternative_url
+        executor = ThreadPoolExecutor(max_workers=len(candidates))
+        try:
+            futures = {executor.submit(self.check_url_status, self.construct_episode_link(slug, episode_number)): slug
+                       for slug in candidates}
+            bad_slugs = []
+            for future in as_completed(futures):
+                slug = futures[future]
+                try:
+                    status_code = future.result()
+                except Exception:
+                    # A failed probe doesn't mean the slug is wrong
+                    continue
+                # Check if the episode link exists (returns 200 if it exists)
+                if status_code == 200:
+                    # The candidates that already answered with an error don't work for this anime
+                    self.slug_cache.remember(url, slug, bad_slugs=bad_slugs)
+                    return self.construct_episode_link(slug, episode_number)
+                bad_slugs.append(slug)
+        finally:
+            # Don't wait for the slower probes once a link was found
+            executor.shutdown(wait=False, cancel_futures=True)
 
         raise Exception(f"Episode {episode_number} not found")
+
+    def forget_episode_slug(self, url):
+        """
+        Forget the slug learned for an anime (e.g. when its episode link turned out to be wrong).
+
+        Args:
+            url (str): The base anime URL.
+        """
+        self.slug_cache.forget(url)
@@ -8,6 +8,12 @@ class DatabaseConfig:
 
     CONNECTION_STRING = os.environ.get("MONGODB_CONNECTION_STRING")
     DATABASE_LOG_PATH = "./Logs/Database.log"
+    DATABASE_LOG_FILENAME = "Database"
+    DATABASE_NAME = os.environ.get("MONGODB_DATABASE", "AnimeWatcher")
+    WATCHED_EPISODES_COLLECTION = "watched_episodes"
+    METADATA_COLLECTION = "metadata"
+    MAX_POOL_SIZE = 10
+    SERVER_SELECTION_TIMEOUT_MS = 5000
 class AnimeWatcherConfig:
     ##############################
     #        Anime Watch          #
@@ -28,6 +34,13 @@ class AnimeFetcherConfig:
     MAX_SLEEP_THRESHOLD = 40
     MIN_SLEEP_DURATION = 60
     MAX_SLEEP_DURATION = 120
+    MAX_WORKERS = 4  # Pages fetched at the same time
+    CHECKPOINT_INTERVAL = 25  # Fetched pages between two saves of the catalog
+    CATALOG_FILE = "./AnimeWatcher/Catalog/catalog.json"
+    CATALOG_INDEX_FILE = "./AnimeWatcher/Catalog/catalog_index.json"  # Inverted index over the catalog titles
+    CATALOG_MAX_AGE = int(os.getenv("CATALOG_MAX_AGE", str(7 * 24 * 3600)))  # Seconds before the catalog is considered stale
+    FUZZY_MIN_SIMILARITY = 0.3  # Minimum trigram similarity of a fuzzy match
+    FUZZY_MAX_RESULTS = 20
     
     
 
@@ -38,6 +51,19 @@ class DriverConfig:
 
     CRX_PATH = "Extensions/uBlock-Origin.crx"
     EXTENSION_PATH = os.getenv("EXTENSION_PATH")
+    DRIVER_CACHE_FILE = "./Driver/driver_cache.json"  # Cached Chrome version and ChromeDriver path
+    # Warm browser daemon (a headless Chrome kept alive between runs, see Driver/browser_daemon.py)
+    USE_BROWSER_DAEMON = os.getenv("BROWSER_DAEMON", "0") == "1"
+    DAEMON_HOST = "127.0.0.1"
+    DAEMON_PORT = int(os.getenv("BROWSER_DAEMON_PORT", "9222"))
+    DAEMON_IDLE_TIMEOUT = int(os.getenv("BROWSER_DAEMON_IDLE_TIMEOUT", "900"))  # Seconds without use before the daemon exits
+    DAEMON_CHECK_INTERVAL = 15  # Seconds between two idle checks
+    DAEMON_START_TIMEOUT = 30  # Seconds to wait for the daemon's browser to start
+    DAEMON_STATE_FILE = "./Driver/browser_daemon.json"
+    DAEMON_HEARTBEAT_FILE = "./Driver/browser_daemon.heartbeat"
+    DAEMON_PROFILE_DIR = "./Driver/BrowserProfile"
+    DAEMON_LOG_PATH = "./Logs/BrowserDaemon.log"
+    DAEMON_LOG_FILENAME = "BrowserDaemon"
     USER_AGENTS = [
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36 Edg/91.0.864.48",
@@ -61,6 +87,26 @@ class WebOperationsConfig:
     QUALITY = "best"
     ANIME_NAME_PAGINATION = "div.anime_name_pagination"
     UL_PAGINATION_LIST = "ul.pagination-list li a"
+    UL_ITEMS = "ul.items"
+    ANIME_NAME = "p.name a"
+    DATA_PAGE = "data-page"
+    ANIME_INFO_TYPE = "p.type"  # Information paragraphs of the anime page
+    OTHER_NAME_LABEL = "Other name"
+    # Markers found in anti-bot challenge pages (the Selenium fallback is used when one is found)
+    CHALLENGE_MARKERS = ["cf-browser-verification", "challenge-platform", "Just a moment...", "cf-chl-"]
+    CHALLENGE_STATUS_CODES = [403, 429, 503]
+    SEARCH_MAX_WORKERS = 4  # Maximum number of search pages fetched at the same time
+
+class SessionConfig:
+    ##############################
+    #        HTTP Session         #
+    ##############################
+    POOL_CONNECTIONS = 10
+    POOL_MAXSIZE = 10
+    RETRY_CONNECT = 3
+    RETRY_BACKOFF_FACTOR = 0.5
+    REQUEST_TIMEOUT = 10
+    PROBE_TIMEOUT = 5  # Timeout of the lightweight requests checking if a link exists
     
 class WebElementsConfig:
     
@@ -81,10 +127,48 @@ class ScriptConfig:
     windows_curse = "windows-curses"
     venv_name = "AnimeWatcherEnv"
     
+class CacheConfig:
+    ##############################
+    #        Caches               #
+    ##############################
+    STREAM_CACHE_FILE = "./AnimeWatcher/Cache/stream_cache.json"
+    STREAM_DEFAULT_TTL = int(os.getenv("STREAM_CACHE_TTL", "1800"))  # Seconds, used when the stream URL is not signed
+    STREAM_EXPIRY_MARGIN = 60  # Seconds removed from the expiry of signed stream URLs
+    EPISODE_COUNT_CACHE_FILE = "./AnimeWatcher/Cache/episode_count_cache.json"
+    EPISODE_COUNT_TTL = int(os.getenv("EPISODE_COUNT_CACHE_TTL", "21600"))  # Seconds, airing animes get new episodes
+
+class PrefetchConfig:
+    ##############################
+    #        Prefetch             #
+    ##############################
+    MAX_WORKERS = 2  # Episodes resolved at the same time in the background
+    PREFETCH_PREVIOUS = os.getenv("PREFETCH_PREVIOUS", "0") == "1"  # Also resolve the previous episode
+
+class BingeConfig:
+    ##############################
+    #        Binge Mode           #
+    ##############################
+    LOOKAHEAD = int(os.getenv("BINGE_LOOKAHEAD", "2"))  # Episodes resolved and queued ahead of the one being played
+
 class EpisodeTrackerConfig:
     ##############################
     #        Episode Tracker      #
     ##############################
     ANIME_WATCHER_JSON_FILE = "./AnimeWatcher/EpisodeTracker/episode_tracker.json"
+    SLUG_CACHE_FILE = "./AnimeWatcher/EpisodeTracker/slug_cache.json"  # Episode link slugs learned per anime
+    STORAGE_BACKEND = os.getenv("EPISODE_TRACKER_BACKEND", "sqlite")  # "sqlite", "json" or "mongodb"
+    SQLITE_FILE = "./AnimeWatcher/EpisodeTracker/episode_tracker.db"
+    SQLITE_TIMEOUT = 10  # Seconds to wait for another instance holding the write lock
+    SAVE_DELAY = 2  # Seconds without changes before the JSON file is written
+    SAVE_MAX_DELAY = 10  # Maximum seconds a change can wait before the JSON file is written
     EPISODE_TRACKER_LOG_PATH = "./Logs/EpisodeTracker.log"
-    EPISODE_TRACKER_LOG_FILENAME = "EpisodeTracker"
\ No newline at end of file
+    EPISODE_TRACKER_LOG_FILENAME = "EpisodeTracker"
+
+class LoggingConfig:
+    ##############################
+    #        Logging              #
+    ##############################
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+    MAX_BYTES = 1024 * 1024  # Size of a log file before it is rotated
+    BACKUP_COUNT = 3  # Rotated log files kept per log
@@ -1,8 +1,96 @@
 import logging
+import logging.handlers
+import threading
+import atexit
+import queue
+import os
+from Config.config import LoggingConfig
+
+# The loggers only put the records in this queue, a single background thread writes them to the files
+log_queue = queue.SimpleQueue()
+log_listener = None
+setup_lock = threading.Lock()
+
+
+class FileRouter(logging.Handler):
+    def __init__(self):
+        """
+        Initializes the handler used by the background thread: each record is written to the file
+        of its logger, every file being opened once (even when several loggers share it).
+        """
+        super().__init__()
+        self.logger_files = {}  # Logger name -> log file
+        self.file_handlers = {}  # Log file -> rotating file handler
+
+    def add_logger(self, logger_name, log_file):
+        """
+        Route the records of the logger to the log file.
+        """
+        if log_file not in self.file_handlers:
+            directory = os.path.dirname(log_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            file_handler = logging.handlers.RotatingFileHandler(
+                log_file, maxBytes=LoggingConfig.MAX_BYTES, backupCount=LoggingConfig.BACKUP_COUNT, delay=True)
+            file_handler.setFormatter(logging.Formatter(LoggingConfig.LOG_FORMAT))
+            self.file_handlers[log_file] = file_handler
+        self.logger_files.setdefault(logger_name, log_file)
+
+    def emit(self, record):
+        file_handler = self.file_handlers.get(self.logger_files.get(record.name))
+        if file_handler is not None:
+            file_handler.handle(record)
+
+    def close(self):
+        for file_handler in self.file_handlers.values():
+            file_handler.close()
+        super().close()
+
+
+file_router = FileRouter()
+
+
+def stop_logging():
+    """ Write the remaining records and close the log files (called at exit). """
+    global log_listener
+    with setup_lock:
+        if log_listener is not None:
+            log_listener.stop()
+            log_listener = None
+        file_router.close()
+
+
+# Registered once at import (setup_logging may start the listener again after a stop)
+atexit.register(stop_logging)
+
+
+def get_log_level():
+    """
+    Get the level of the loggers from LoggingConfig.LOG_LEVEL (a level name or number).
+
+    Returns:
+        int: The log level, INFO if the configured level is not valid.
+    """
+    level = str(LoggingConfig.LOG_LEVEL).strip().upper() or "INFO"
+    if level.isdigit():
+        return int(level)
+    if isinstance(logging.getLevelName(level), int):
+        return logging.getLevelName(level)
+    logging.getLogger(__name__).warning(f"Invalid LOG_LEVEL {LoggingConfig.LOG_LEVEL!r}, using INFO")
+    return logging.INFO
+
+
+log_level = get_log_level()
+
+
 def setup_logging(logger_name, log_file):
     """
     Set up logging configuration.
 
+    The logger only puts its records in a queue (no disk I/O on the calling thread), they are written
+    by a single background thread to a rotating log file. Calling it again for the same logger
+    returns the logger without adding another handler.
+
     Args:
         logger_name (str): Name of the logger.
         log_file (str): Path to the log file.
@@ -10,18 +98,23 @@ def setup_logging(logger_name, log_file):
     Returns:
         logging.Logger: Configured logger object.
     """
+    global log_listener
     if not logger_name:
         logger_name = 'default_logger'  # Provide a default logger name if not specified
-    
+
     logger = logging.getLogger(logger_name)  # Create a logger
-    logger.setLevel(logging.INFO)  # Set the log level to INFO of the logger
-    
-    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')  # Format the log messages
-    
-    file_handler = logging.FileHandler(log_file)  # Log to a file
-    file_handler.setLevel(logging.INFO)  # Set the log level to INFO of the file handler
-    file_handler.setFormatter(formatter)  # Set the formatter for the file handler
-    
-    logger.addHandler(file_handler)  # Add the file handler to the logger
-    
-    return logger
\ No newline at end of file
+    with setup_lock:
+        file_router.add_logger(logger_name, log_file)
+        if log_listener is None:
+            # Start the background writer on the first call
+            log_listener = logging.handlers.QueueListener(log_queue, file_router)
+            log_listener.start()
+
+        # Guard against duplicate handlers (the modules set up the same loggers at import time)
+        if not any(isinstance(handler, logging.handlers.QueueHandler) for handler in logger.handlers):
+            logger.setLevel(log_level)
+            logger.addHandler(logging.handlers.QueueHandler(log_queue))
+            # The records are only written once, not again by the root logger's handlers
+            logger.propagate = False
+
+    return logger
@@ -0,0 +1,143 @@
+# Background service keeping one configured headless Chrome alive between runs of animewatch.py
+# Start it with: python -m Driver.browser_daemon (it is also started automatically when BROWSER_DAEMON=1)
+from Driver.driver_config import driver_setup, attach_driver
+from Config.config import DriverConfig
+from Config.logs_config import setup_logging
+import subprocess
+import socket
+import json
+import time
+import sys
+import os
+
+# Logging configuration
+logger = setup_logging(DriverConfig.DAEMON_LOG_FILENAME, DriverConfig.DAEMON_LOG_PATH)
+
+# Root of the project (the daemon is started from there so the relative paths of the config resolve)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def get_debugger_address():
+    """
+    Function to get the remote-debugging address of the daemon's browser.
+    """
+    return f"{DriverConfig.DAEMON_HOST}:{DriverConfig.DAEMON_PORT}"
+
+def is_daemon_running():
+    """
+    Function to check if the daemon's browser accepts connections.
+
+    Returns:
+        bool: True if the remote-debugging port is open, False otherwise.
+    """
+    try:
+        with socket.create_connection((DriverConfig.DAEMON_HOST, DriverConfig.DAEMON_PORT), timeout=1):
+            return True
+    except OSError:
+        return False
+
+def touch_heartbeat():
+    """
+    Function to record that the daemon's browser was used (resets the idle timeout).
+    """
+    try:
+        with open(DriverConfig.DAEMON_HEARTBEAT_FILE, 'a'):
+            os.utime(DriverConfig.DAEMON_HEARTBEAT_FILE, None)
+    except OSError as e:
+        logger.error(f"Error while updating the daemon heartbeat: {e}")
+
+def get_idle_time():
+    """
+    Function to get the number of seconds since the daemon's browser was last used.
+    """
+    try:
+        return time.time() - os.path.getmtime(DriverConfig.DAEMON_HEARTBEAT_FILE)
+    except OSError:
+        return 0
+
+def write_state():
+    """
+    Function to save the daemon's process id and address.
+    """
+    with open(DriverConfig.DAEMON_STATE_FILE, 'w') as file:
+        json.dump({"pid": os.getpid(), "address": get_debugger_address()}, file, indent=4)
+
+def remove_state():
+    """
+    Function to remove the daemon's state and heartbeat files.
+    """
+    for path in (DriverConfig.DAEMON_STATE_FILE, DriverConfig.DAEMON_HEARTBEAT_FILE):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def start_daemon():
+    """
+    Function to start the daemon in a detached background process and wait for its browser.
+
+    Raises:
+        TimeoutError: If the browser is not reachable after DriverConfig.DAEMON_START_TIMEOUT seconds.
+    """
+    # Detach the daemon from the current terminal so it survives the end of the run
+    if os.name == 'nt':
+        process_options = {"creationflags": subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP}
+    else:
+        process_options = {"start_new_session": True}
+
+    subprocess.Popen([sys.executable, "-m", "Driver.browser_daemon"], cwd=PROJECT_ROOT,
+                     stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                     **process_options)
+
+    deadline = time.time() + DriverConfig.DAEMON_START_TIMEOUT
+    while time.time() < deadline:
+        if is_daemon_running():
+            return
+        time.sleep(0.25)
+    raise TimeoutError("The browser daemon did not start in time")
+
+def connect_to_daemon():
+    """
+    Function to attach a web driver to the daemon's browser, starting the daemon if needed.
+
+    Returns:
+        WebDriver: The web driver attached to the daemon's browser.
+    """
+    if not is_daemon_running():
+        logger.info("Starting the browser daemon")
+        start_daemon()
+    touch_heartbeat()
+    return attach_driver(get_debugger_address())
+
+def run_daemon():
+    """
+    Function to run the daemon: start the configured browser and keep it alive until it is idle
+    for more than DriverConfig.DAEMON_IDLE_TIMEOUT seconds.
+    """
+    if is_daemon_running():
+        logger.info("The browser daemon is already running")
+        return
+
+    driver = driver_setup(remote_debugging_port=DriverConfig.DAEMON_PORT)
+    write_state()
+    touch_heartbeat()
+    logger.info(f"Browser daemon listening on {get_debugger_address()}")
+
+    try:
+        while get_idle_time() < DriverConfig.DAEMON_IDLE_TIMEOUT:
+            time.sleep(DriverConfig.DAEMON_CHECK_INTERVAL)
+            # Stop if the browser was closed
+            if not is_daemon_running():
+                logger.warning("The daemon's browser is not reachable anymore")
+                break
+        logger.info("Browser daemon stopping")
+    finally:
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.error(f"Error while closing the daemon's browser: {e}")
+        remove_state()
+
+
+if __name__ == "__main__":
+    run_daemon()
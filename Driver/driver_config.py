@@ -3,23 +3,105 @@ import undetected_chromedriver as uc
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
+from webdriver_manager.core.os_manager import OperationSystemManager, ChromeType
 import random
-from Config.config import DriverConfig
+from Config.config import DriverConfig, AnimeWatcherConfig
+from Config.logs_config import setup_logging
 from selenium.common.exceptions import WebDriverException
+import json
+import os
 import sys
 
+# Logging configuration
+logger = setup_logging(AnimeWatcherConfig.ANIME_WATCH_LOG_FILENAME,
+                       AnimeWatcherConfig.ANIME_WATCH_LOG_PATH)
+
+
+def get_chrome_version():
+    """
+    Function to detect the version of Google Chrome installed on the user's system (no network access).
+
+    Returns:
+        str: The installed Chrome version, or None if it could not be detected.
+    """
+    try:
+        return OperationSystemManager().get_browser_version_from_os(ChromeType.GOOGLE)
+    except Exception as e:
+        logger.warning(f"Could not detect the Chrome version: {e}")
+        return None
+
+def get_major_version(version):
+    """
+    Function to get the major part of a version string (e.g. "120" for "120.0.6099.109").
+    """
+    return version.split('.')[0] if version else None
+
+def read_driver_cache():
+    """
+    Function to read the cached ChromeDriver resolution.
+
+    Returns:
+        dict: The cached Chrome version and driver path, empty if there is no cache.
+    """
+    try:
+        with open(DriverConfig.DRIVER_CACHE_FILE, 'r') as file:
+            return json.load(file)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+def write_driver_cache(chrome_version, driver_path):
+    """
+    Function to save the ChromeDriver resolution so the next launches can skip the network.
+
+    Args:
+        chrome_version (str): The installed Chrome version.
+        driver_path (str): The path to the ChromeDriver executable.
+    """
+    try:
+        with open(DriverConfig.DRIVER_CACHE_FILE, 'w') as file:
+            json.dump({
+                "chrome_version": chrome_version,
+                "chrome_major": get_major_version(chrome_version),
+                "driver_path": driver_path
+            }, file, indent=4)
+    except OSError as e:
+        logger.error(f"Error while writing the driver cache: {e}")
 
 def check_chrome_installed():
     """
-    Function to check if Google Chrome is installed on the user's system.
+    Function to check if Google Chrome is installed on the user's system and resolve the matching ChromeDriver.
+
+    The driver path is cached and reused without any network access, it is only resolved again
+    (with ChromeDriverManager) when the major version of the installed Chrome changes.
+
+    Returns:
+        str: The path to the ChromeDriver executable.
     """
+    chrome_version = get_chrome_version()
+    cache = read_driver_cache()
+    cached_path = cache.get("driver_path")
+    cached_path = cached_path if cached_path and os.path.exists(cached_path) else None
+
+    # Reuse the cached driver if Chrome was not upgraded (or if the version can't be detected)
+    if cached_path and (chrome_version is None or get_major_version(chrome_version) == cache.get("chrome_major")):
+        return cached_path
+
     try:
         # Try to install ChromeDriver 
-        ChromeDriverManager().install()
+        driver_path = ChromeDriverManager().install()
     except WebDriverException:
         # Chrome is not installed on the system
         print("Chrome is not installed on your system. Please install it and try again.")
         sys.exit()
+    except Exception as e:
+        # Offline: use the previous driver rather than failing
+        if cached_path:
+            logger.warning(f"Could not resolve ChromeDriver, using the cached driver: {e}")
+            return cached_path
+        raise
+
+    write_driver_cache(chrome_version, driver_path)
+    return driver_path
 
 def configure_browser_options(options, user_agents, crx_path):
     """
@@ -48,10 +130,14 @@ def configure_browser_options(options, user_agents, crx_path):
     # Adding argument to disable the AutomationControlled flag
     options.add_argument("--disable-blink-features=AutomationControlled")
 
-def driver_setup():
+def driver_setup(remote_debugging_port=None):
     """
     Set up and configure the web driver for automated browser testing.
 
+    Args:
+        remote_debugging_port (int, optional): If set, the browser listens on this port and uses a persistent profile
+            so other processes can attach to it (used by the browser daemon). Defaults to None.
+
     Returns:
         WebDriver: The configured web driver instance.
     Raises:
@@ -66,6 +152,11 @@ def driver_setup():
         options.add_argument('--headless')
         # Disable logging and configure other options
         configure_browser_options(options, DriverConfig.USER_AGENTS, DriverConfig.CRX_PATH)
+        if remote_debugging_port:
+            # Allow other processes to attach to the browser
+            options.add_argument(f"--remote-debugging-port={remote_debugging_port}")
+            # Keep the profile warm between browser restarts
+            options.add_argument(f"--user-data-dir={os.path.abspath(DriverConfig.DAEMON_PROFILE_DIR)}")
         # ChromeDriverManager will install the latest version of ChromeDriver
         driver = webdriver.Chrome(service=Service(
             check_chrome_installed()), options=options)
@@ -80,6 +171,21 @@ def driver_setup():
         # Raise the exception
         raise e
 
+def attach_driver(debugger_address):
+    """
+    Attach a web driver to a browser that is already running (see Driver/browser_daemon.py).
+
+    Args:
+        debugger_address (str): The remote-debugging address of the browser (host:port).
+
+    Returns:
+        WebDriver: The web driver attached to the running browser.
+    """
+    options = Options()
+    # The browser is already configured, only tell ChromeDriver where to find it
+    options.add_experimental_option("debuggerAddress", debugger_address)
+    return webdriver.Chrome(service=Service(check_chrome_installed()), options=options)
+
 
 """def driver_setup():
     #options = Options()
@@ -0,0 +1,15 @@
+# Script to build the local anime catalog
+from AnimeWatcher.AnimeFetcher import main as fetch_main
+from Config.logs_config import setup_logging
+from Config.config import AnimeFetcherConfig
+# Set up the logger
+logger = setup_logging(AnimeFetcherConfig.ANIME_FETCH_LOG_FILENAME,AnimeFetcherConfig.ANIME_FETCH_LOG_PATH)
+
+def main():
+    try:
+        fetch_main()
+    except Exception as e:
+        logger.error(f"Unexpected exception in animefetch.py: {e}")
+        raise
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+from Config import config
+import tempfile
+import os
+
+
+def pytest_configure():
+    """ Write the logs of the tests to a temporary folder instead of ./Logs. """
+    log_directory = tempfile.mkdtemp(prefix="anime-watcher-logs-")
+    for config_class in vars(config).values():
+        if not isinstance(config_class, type):
+            continue
+        for name, value in vars(config_class).items():
+            if name.endswith("LOG_PATH") and isinstance(value, str):
+                setattr(config_class, name, os.path.join(log_directory, os.path.basename(value)))
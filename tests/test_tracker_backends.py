@@ -0,0 +1,95 @@
+import json
+from unittest import mock
+
+import pytest
+
+mongomock = pytest.importorskip("mongomock")
+pytest.importorskip("pymongo")
+
+from AnimeWatcher.TrackerBackends import MongoTrackerBackend
+
+
+@pytest.fixture
+def json_file(tmp_path):
+    """ A tracker JSON file with both the range form and the older list form. """
+    path = tmp_path / "episode_tracker.json"
+    path.write_text(json.dumps([
+        {'title': 'One Piece', 'watched_episodes': '1-3,5'},
+        {'title': 'Naruto', 'watched_episodes': [1, 2]},
+    ]))
+    return str(path)
+
+
+@pytest.fixture
+def backend(json_file):
+    """ A MongoDB backend running on an in-memory mongomock client. """
+    with mock.patch("pymongo.MongoClient", mongomock.MongoClient):
+        backend = MongoTrackerBackend("mongodb://localhost", json_file)
+    yield backend
+    backend.close()
+
+
+def watched(backend, title):
+    return list(backend.get_watched_episodes(title))
+
+
+def test_json_file_is_imported_with_bulk_write(backend):
+    assert watched(backend, 'One Piece') == [1, 2, 3, 5]
+    assert watched(backend, 'Naruto') == [1, 2]
+    assert backend.metadata.find_one({'_id': 'json_migrated'})
+
+
+def test_json_file_is_only_imported_once(backend, json_file):
+    backend.collection.delete_one({'title': 'Naruto'})
+    backend.migrate_json_file(json_file)
+    assert backend.get_watched_episodes('Naruto') is None
+
+
+def test_import_history_merges_with_existing_documents(backend):
+    backend.import_history({'One Piece': [3, 4], 'Bleach': [7]})
+    assert watched(backend, 'One Piece') == [1, 2, 3, 4, 5]
+    assert watched(backend, 'Bleach') == [7]
+    assert backend.collection.count_documents({'title': 'One Piece'}) == 1
+
+
+def test_add_anime_upserts_an_empty_document(backend):
+    backend.add_anime('Bleach')
+    assert watched(backend, 'Bleach') == []
+    # Adding it again keeps its episodes
+    backend.add_episode('Bleach', 1)
+    backend.add_anime('Bleach')
+    assert watched(backend, 'Bleach') == [1]
+
+
+def test_add_episode_uses_add_to_set(backend):
+    backend.add_episode('Naruto', 3)
+    backend.add_episode('Naruto', 3)
+    document = backend.collection.find_one({'title': 'Naruto'})
+    assert sorted(document['watched_episodes']) == [1, 2, 3]
+
+
+def test_add_episode_upserts_a_new_anime(backend):
+    backend.add_episode('Bleach', 12)
+    assert watched(backend, 'Bleach') == [12]
+
+
+def test_untracked_anime_has_no_episodes(backend):
+    assert backend.get_watched_episodes('Dragon Ball') is None
+
+
+def test_missing_connection_string_is_rejected(json_file):
+    with pytest.raises(ValueError):
+        MongoTrackerBackend("", json_file)
+
+
+def test_unreadable_json_file_is_imported_on_the_next_start(tmp_path):
+    path = tmp_path / "episode_tracker.json"
+    path.write_text('[{"title": ')
+    with mock.patch("pymongo.MongoClient", mongomock.MongoClient):
+        backend = MongoTrackerBackend("mongodb://localhost", str(path))
+        assert backend.metadata.find_one({'_id': 'json_migrated'}) is None
+
+        path.write_text(json.dumps([{'title': 'Bleach', 'watched_episodes': [1]}]))
+        backend.migrate_json_file(str(path))
+    assert watched(backend, 'Bleach') == [1]
+    assert backend.metadata.find_one({'_id': 'json_migrated'})